@@ -0,0 +1,90 @@
+# analytics/montecarlo.py
+from __future__ import annotations
+from typing import Dict, Literal, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+from backtest.records import trade_columns
+
+Method = Literal["bootstrap", "permutation"]
+
+def trade_returns(trades) -> np.ndarray:
+    """
+    Per-trade return on the pre-exit equity: pnl / (equity_after - pnl), the equity just before
+    the trade's exit was booked. That is the equity at entry when positions don't overlap
+    (run_backtest, paper); in run_portfolio logs it also holds other trades closed meanwhile.
+    """
+    cols = trade_columns(trades)
+    pnl = cols["pnl"]
+    return pnl / (cols["equity_after"] - pnl)
+
+def monte_carlo(
+    trades,
+    n_paths: int = 10_000,
+    method: Method = "bootstrap",
+    initial_equity: Optional[float] = None,
+    ruin_pct: float = 0.5,
+    max_cells: int = 2_000_000,
+    seed: Optional[int] = None,
+) -> Dict:
+    """
+    Resample the trade sequence n_paths times and replay it with compounding.
+    - bootstrap: draw trades with replacement; permutation: shuffle the order
+    - returns are pnl / pre-exit equity (trade_returns), so resampled paths keep risk-% sizing
+    - ruin = equity falling to initial_equity * (1 - ruin_pct) at any point
+    Paths are simulated as a (paths x trades) matrix, max_cells entries at a time,
+    so memory stays bounded for 100k paths on long trade lists.
+    """
+    r = trade_returns(trades)
+    n = len(r)
+    if initial_equity is None:
+        cols = trade_columns(trades)
+        initial_equity = float(cols["equity_after"][0] - cols["pnl"][0]) if n else 0.0
+    rng = np.random.default_rng(seed)
+
+    final_eq = np.full(n_paths, initial_equity)
+    max_dd = np.zeros(n_paths)
+    max_dd_pct = np.zeros(n_paths)
+    ruined = np.zeros(n_paths, dtype=bool)
+    if n == 0:
+        return _result(final_eq, max_dd, max_dd_pct, ruined, method)
+
+    ruin_level = initial_equity * (1.0 - ruin_pct)
+    rows = max(1, max_cells // n)
+    for a in range(0, n_paths, rows):
+        k = min(rows, n_paths - a)
+        if method == "bootstrap":
+            sample = r[rng.integers(0, n, size=(k, n))]
+        elif method == "permutation":
+            sample = rng.permuted(np.broadcast_to(r, (k, n)), axis=1)
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+
+        eq = initial_equity * np.cumprod(1.0 + sample, axis=1)
+        peak = np.maximum(np.maximum.accumulate(eq, axis=1), initial_equity)
+        dd = peak - eq
+
+        final_eq[a:a + k] = eq[:, -1]
+        max_dd[a:a + k] = dd.max(axis=1)
+        max_dd_pct[a:a + k] = (dd / peak).max(axis=1) * 100.0
+        ruined[a:a + k] = eq.min(axis=1) <= ruin_level
+
+    return _result(final_eq, max_dd, max_dd_pct, ruined, method)
+
+def _result(final_eq, max_dd, max_dd_pct, ruined, method) -> Dict:
+    return {
+        "method": method,
+        "final_equity": final_eq,
+        "max_dd": max_dd,
+        "max_dd_pct": max_dd_pct,
+        "ruined": ruined,
+        "risk_of_ruin": float(ruined.mean()) if len(ruined) else 0.0,
+    }
+
+def summarize(mc: Dict, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+    """Percentile table of the simulated distributions (rows = metric, cols = percentile)."""
+    cols = [f"p{p:g}" for p in percentiles]
+    return pd.DataFrame(
+        {k: np.percentile(mc[k], percentiles) for k in ("final_equity", "max_dd", "max_dd_pct")},
+        index=cols,
+    ).T
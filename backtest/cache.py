@@ -0,0 +1,126 @@
+# backtest/cache.py
+from __future__ import annotations
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+from strategy.base import Strategy
+from backtest.engine import run_backtest, BTConfig
+
+CACHE_VERSION = 2  # bump when engine semantics change so old results are never served
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Content hash of a frame (index + all columns), vectorized via pandas row hashing."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+def result_key(data_digest: str, strategy: Strategy, cfg: BTConfig, intrabar: Any = None) -> str:
+    """Key = data content + strategy class/params + BTConfig (+ intrabar source if used)."""
+    cls = type(strategy)
+    payload = {
+        "v": CACHE_VERSION,
+        "data": data_digest,
+        "strategy": f"{cls.__module__}.{cls.__qualname__}",
+        "params": strategy.params(),
+        "cfg": asdict(cfg),
+        "intrabar": [intrabar.symbol, intrabar.category] if intrabar is not None else None,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=20).hexdigest()
+
+class BacktestCache:
+    """
+    On-disk, content-addressed store of run_backtest results with size-bounded LRU eviction.
+    Entries are keyed by result_key(), so any change in the candles, the strategy params or
+    the BTConfig simply produces a new key (stale entries age out via LRU).
+    Safe to share between processes: writes go to a temp file and are renamed into place.
+    """
+    def __init__(self, root: Path = Path("storage/bt_cache"), max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._approx_bytes: Optional[int] = None  # running estimate; full scan only when over budget
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass  # evicted meanwhile / read-only cache: still a hit
+        return result
+
+    def put(self, key: str, result: Dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+        if self._approx_bytes is None:
+            self.evict()
+        else:
+            self._approx_bytes += path.stat().st_size
+            if self._approx_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for p in self.root.glob("*/*.pkl"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total > self.max_bytes:
+            for _, size, p in sorted(entries):
+                p.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._approx_bytes = total
+
+    def clear(self) -> None:
+        for p in self.root.glob("*/*.pkl"):
+            p.unlink(missing_ok=True)
+        self._approx_bytes = 0
+
+def cached_backtest(
+    df: pd.DataFrame,
+    strategy: Strategy,
+    cfg: Optional[BTConfig] = None,
+    cache: Optional[BacktestCache] = None,
+    data_digest: Optional[str] = None,
+    **kwargs,
+) -> Dict:
+    """
+    run_backtest() with a disk cache in front. Pass data_digest (frame_digest(df)) when running
+    many configs on the same frame to hash the candles only once.
+    """
+    cfg = cfg or BTConfig()
+    cache = cache or BacktestCache()
+    key = result_key(data_digest or frame_digest(df), strategy, cfg, kwargs.get("intrabar"))
+    result = cache.get(key)
+    if result is None:
+        result = run_backtest(df, strategy, cfg, **kwargs)
+        cache.put(key, result)
+    return result
@@ -1,12 +1,17 @@
 # backtest/engine.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Dict, Optional
-import math
+from typing import Dict, Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
 
 from strategy.base import Strategy
 from risk.manager import position_size, propose_levels
+from backtest.exits import find_exit, hits_both
+from backtest.records import TradeLog
+
+if TYPE_CHECKING:
+    from backtest.intrabar import IntrabarResolver
 
 @dataclass
 class BTConfig:
@@ -25,16 +30,24 @@ def run_backtest(
     df: pd.DataFrame,
     strategy: Strategy,
     cfg: Optional[BTConfig] = None,
+    signals: Optional[pd.DataFrame] = None,
+    intrabar: Optional[IntrabarResolver] = None,
 ) -> Dict:
     """
     df must have columns: open, high, low, close, volume (datetime index, oldest->newest)
     strategy.generate_signal(df_slice) returns meta with 'atr14' ideally.
+    If the strategy implements generate_signals(df), all signals are computed in one
+    vectorized pass instead of re-running the strategy on a growing slice every bar.
+    signals: optional precomputed strategy.generate_signals(df) for this same df, so
+    callers running many BTConfigs (sweeps) pay for the signal pass only once.
+    intrabar: optional IntrabarResolver; bars touching both SL and TP are then resolved
+    from 1m candles instead of assuming SL first.
     """
     cfg = cfg or BTConfig()
 
     equity = cfg.initial_equity
-    equity_curve = []  # list of (timestamp, equity)
-    trades: List[Dict] = []
+    index = df.index
+    trades = TradeLog(tz=str(index.tz) if index.tz is not None else None)
 
     in_pos = False
     pos_side = None     # "LONG" | "SHORT"
@@ -43,103 +56,88 @@ def run_backtest(
     sl_px = None
     tp_px = None
 
-    rows = list(df.itertuples())  # faster iteration
+    # plain arrays: the exit search works on slices of high/low
+    opens = df["open"].to_numpy(dtype=float)
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
+    closes = df["close"].to_numpy(dtype=float)
+    n = len(df)
+    eq = np.empty(n)  # equity per bar (stair-step: only changes on exits)
+
+    # Batch signals (one pass) when the strategy supports it; else per-bar slices
+    batch = signals if signals is not None else strategy.generate_signals(df)
+    if batch is not None:
+        batch_sig = batch["signal"].to_numpy()
+        batch_atr = batch["atr14"].to_numpy(dtype=float)
+        entry_bars = np.flatnonzero(batch_sig != "FLAT")  # only these bars can open a trade
     # Start from warmup so indicators are ready
     start_idx = max(strategy.warmup(), 2)
-    for i in range(start_idx, len(rows) - 1):
-        # we will ENTER at next bar open if signal occurs on bar i (rows[i])
-        # use a slice up to current bar (inclusive) for the strategy
-        df_slice = df.iloc[: i + 1]
-        sig = strategy.generate_signal(df_slice)
-        cur = rows[i]
-        nxt = rows[i + 1]  # next bar (where entries happen)
-        ts = cur.Index
-
-        # Mark equity (stair-step equity curve: only on closes/exits)
-        equity_curve.append((ts, equity))
-
-        # If in position, check SL/TP intrabar on current bar
+    i = start_idx
+    while i < n - 1:
+        # If in position, jump straight to the first bar that touches SL/TP
+        # (bars in between can't change anything: equity is flat, no new entries)
         if in_pos:
-            high = cur.high
-            low = cur.low
-
-            # Did we hit SL or TP within the bar?
-            exit_reason = None
-            exit_px = None
-
+            j, exit_reason = find_exit(highs, lows, i, n - 1, pos_side, sl_px, tp_px)
+            if j < 0:
+                eq[i:n - 1] = equity  # still open at the end of the data
+                break
+            eq[i:j + 1] = equity  # marked before the exit, like a bar-by-bar loop would
+            i = j
+            if intrabar is not None and hits_both(pos_side, highs[i], lows[i], sl_px, tp_px):
+                exit_reason = intrabar.resolve(pos_side, sl_px, tp_px, index[i])
+            exit_px = sl_px if exit_reason == "SL" else tp_px
+
+            # fees + slippage on exit
+            slip = _bps(exit_px, cfg.slippage_bps)
+            fee = _bps(exit_px, cfg.fee_bps)
             if pos_side == "LONG":
-                hit_sl = (low <= sl_px)
-                hit_tp = (high >= tp_px)
-                # assume worst/best: if both, SL/TP order priority? use SL first conservatively
-                if hit_sl and hit_tp:
-                    # conservative: assume SL first
-                    exit_reason = "SL"
-                    exit_px = sl_px
-                elif hit_sl:
-                    exit_reason = "SL"
-                    exit_px = sl_px
-                elif hit_tp:
-                    exit_reason = "TP"
-                    exit_px = tp_px
-            else:  # SHORT
-                hit_sl = (high >= sl_px)
-                hit_tp = (low <= tp_px)
-                if hit_sl and hit_tp:
-                    exit_reason = "SL"
-                    exit_px = sl_px
-                elif hit_sl:
-                    exit_reason = "SL"
-                    exit_px = sl_px
-                elif hit_tp:
-                    exit_reason = "TP"
-                    exit_px = tp_px
-
-            if exit_reason:
-                # fees + slippage on exit
-                slip = _bps(exit_px, cfg.slippage_bps)
-                fee = _bps(exit_px, cfg.fee_bps)
-                if pos_side == "LONG":
-                    pnl_per_unit = (exit_px - entry_px) - fee - slip
-                else:
-                    pnl_per_unit = (entry_px - exit_px) - fee - slip
-                trade_pnl = pnl_per_unit * qty
-
-                equity += trade_pnl
-                trades.append({
-                    "entry_time": entry_time,
-                    "exit_time": ts,
-                    "side": pos_side,
-                    "entry_px": entry_px,
-                    "exit_px": exit_px,
-                    "qty": qty,
-                    "reason": exit_reason,
-                    "pnl": trade_pnl,
-                    "equity_after": equity,
-                })
-                # flat
-                in_pos = False
-                pos_side = None
-                entry_px = None
-                sl_px = None
-                tp_px = None
-                qty = 0.0
-
-        # If flat, consider entering on next bar open based on today's signal
-        if not in_pos:
-            if sig["signal"] in ("LONG", "SHORT"):
-                # Need ATR for stop distance; fallback to simple fraction if missing
-                atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(df_slice["close"].iloc[-1] * 0.005)
-                # Entry on next bar open
-                e_px = nxt.open
-                # Propose SL/TP
-                lvls = propose_levels(e_px, atr, cfg.atr_mult_sl, cfg.atr_mult_tp,
-                                      side=("Buy" if sig["signal"] == "LONG" else "Sell"))
-                sl = lvls["sl"]
-                tp = lvls["tp"]
-                stop_distance = abs(e_px - sl)
-                if stop_distance <= 0:
-                    continue
-
+                pnl_per_unit = (exit_px - entry_px) - fee - slip
+            else:
+                pnl_per_unit = (entry_px - exit_px) - fee - slip
+            trade_pnl = pnl_per_unit * qty
+
+            equity += trade_pnl
+            trades.append(entry_time, index[i], pos_side, exit_reason,
+                          entry_px, exit_px, qty, trade_pnl, equity)
+            # flat
+            in_pos = False
+            pos_side = None
+            entry_px = None
+            sl_px = None
+            tp_px = None
+            qty = 0.0
+        elif batch is not None:
+            # Flat: jump to the next bar with a signal (nothing happens in between)
+            k = np.searchsorted(entry_bars, i)
+            nxt = entry_bars[k] if k < len(entry_bars) else n - 1
+            nxt = min(nxt, n - 1)
+            eq[i:nxt + 1] = equity  # stair-step equity curve: only changes on exits
+            i = nxt
+            if i >= n - 1:
+                break
+        else:
+            # Mark equity (stair-step equity curve: only on closes/exits)
+            eq[i] = equity
+
+        # Flat: consider entering on next bar open based on this bar's signal
+        if batch is not None:
+            sig = {"signal": batch_sig[i], "meta": {"atr14": batch_atr[i]}}
+        else:
+            # use a slice up to current bar (inclusive) for the strategy
+            sig = strategy.generate_signal(df.iloc[: i + 1])
+
+        if sig["signal"] in ("LONG", "SHORT"):
+            # Need ATR for stop distance; fallback to simple fraction if missing
+            atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(closes[i] * 0.005)
+            # Entry on next bar open
+            e_px = float(opens[i + 1])
+            # Propose SL/TP
+            lvls = propose_levels(e_px, atr, cfg.atr_mult_sl, cfg.atr_mult_tp,
+                                  side=("Buy" if sig["signal"] == "LONG" else "Sell"))
+            sl = lvls["sl"]
+            tp = lvls["tp"]
+            stop_distance = abs(e_px - sl)
+            if stop_distance > 0:
                 # Position size from risk
                 q = position_size(equity, cfg.risk_pct, stop_distance)
 
@@ -154,9 +152,12 @@ def run_backtest(
                 sl_px = sl
                 tp_px = tp
                 qty = q
-                entry_time = rows[i + 1].Index
-
-    # append final equity point
-    equity_curve.append((rows[-1].Index, equity))
-    eq_series = pd.Series({t: v for t, v in equity_curve}).sort_index()
+                entry_time = index[i + 1]
+        i += 1
+
+    # final equity point on the last bar; the curve is a view of the per-bar array
+    if n:
+        eq[n - 1] = equity
+    first = min(start_idx, n - 1) if n else 0
+    eq_series = pd.Series(eq[first:], index=index[first:], copy=False)
     return {"trades": trades, "equity_curve": eq_series, "final_equity": equity}
@@ -0,0 +1,60 @@
+# backtest/exits.py
+from __future__ import annotations
+from typing import Optional, Tuple
+import numpy as np
+
+# SL/TP resolution shared by the backtester and the paper runner.
+# Tie rule: if one bar touches both SL and TP we conservatively assume SL was hit first.
+
+def bar_exit(side: str, high: float, low: float, sl: float, tp: float) -> Tuple[Optional[str], Optional[float]]:
+    """Single-bar check -> ("SL"|"TP", exit price) or (None, None)."""
+    if side == "LONG":
+        hit_sl = (low <= sl)
+        hit_tp = (high >= tp)
+    else:  # SHORT
+        hit_sl = (high >= sl)
+        hit_tp = (low <= tp)
+    if hit_sl:
+        return "SL", sl
+    if hit_tp:
+        return "TP", tp
+    return None, None
+
+def find_exit(
+    high: np.ndarray,
+    low: np.ndarray,
+    start: int,
+    end: int,
+    side: str,
+    sl: float,
+    tp: float,
+) -> Tuple[int, Optional[str]]:
+    """
+    First bar j in [start, end) whose high/low touches SL or TP -> (j, "SL"|"TP").
+    Returns (-1, None) if the position survives to `end`.
+    Scans in geometrically growing chunks, so short trades don't pay for a full-array compare
+    and long holds cost a handful of vectorized passes instead of a Python loop per bar.
+    """
+    size = 32
+    a = start
+    while a < end:
+        b = min(end, a + size)
+        if side == "LONG":
+            hit_sl = low[a:b] <= sl
+            hit_tp = high[a:b] >= tp
+        else:  # SHORT
+            hit_sl = high[a:b] >= sl
+            hit_tp = low[a:b] <= tp
+        hit = hit_sl | hit_tp
+        k = int(hit.argmax())
+        if hit[k]:
+            return a + k, ("SL" if hit_sl[k] else "TP")
+        a = b
+        size *= 2
+    return -1, None
+
+def hits_both(side: str, high: float, low: float, sl: float, tp: float) -> bool:
+    """True if the bar touches SL and TP, i.e. the hit order is ambiguous on this timeframe."""
+    if side == "LONG":
+        return bool(low <= sl and high >= tp)
+    return bool(high >= sl and low <= tp)
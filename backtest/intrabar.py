@@ -0,0 +1,72 @@
+# backtest/intrabar.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.market_data import fetch_ohlcv, interval_ms, MAX_KLINES
+from backtest.exits import find_exit, hits_both
+
+class IntrabarResolver:
+    """
+    Resolves bars where both SL and TP were touched by looking at the 1m candles of
+    THAT bar only. Minute bars are fetched lazily per ambiguous bar (and kept on disk as
+    tiny .npy files), so memory and API volume scale with the number of ambiguous bars,
+    never with the length of the backtest.
+    If a single minute still touches both levels (or no data is available) we fall back
+    to the conservative SL-first rule.
+    """
+    def __init__(self, symbol: str, interval: str, category: str = "linear",
+                 cache_dir: Path = Path("storage/intrabar")):
+        self.symbol = symbol
+        self.interval = interval  # timeframe of the bars being resolved
+        self.category = category
+        self.cache_dir = Path(cache_dir) / category / symbol
+        self.stats: Dict[str, int] = {"resolved": 0, "fallback": 0, "fetched": 0}
+
+    def bar_end(self, bar_start: pd.Timestamp) -> pd.Timestamp:
+        """End of the bar starting at bar_start (not the next row's time: data can have gaps)."""
+        return bar_start + pd.Timedelta(milliseconds=interval_ms(self.interval))
+
+    def resolve(self, side: str, sl: float, tp: float, bar_start: pd.Timestamp,
+                bar_end: Optional[pd.Timestamp] = None) -> str:
+        """Which level was hit first inside [bar_start, bar_end)? -> "SL" | "TP"."""
+        bar_end = bar_end if bar_end is not None else self.bar_end(bar_start)
+        high, low = self._minutes(int(bar_start.timestamp() * 1000), int(bar_end.timestamp() * 1000))
+        j, reason = find_exit(high, low, 0, len(high), side, sl, tp)
+        if j < 0 or hits_both(side, high[j], low[j], sl, tp):  # no data / still ambiguous -> SL first
+            self.stats["fallback"] += 1
+            return "SL"
+        self.stats["resolved"] += 1
+        return reason
+
+    def _minutes(self, start_ms: int, end_ms: int) -> Tuple[np.ndarray, np.ndarray]:
+        path = self.cache_dir / f"{start_ms}-{end_ms}.npy"
+        if path.exists():
+            hl = np.load(path)
+            return hl[0], hl[1]
+
+        frames = []
+        a = start_ms
+        while a < end_ms:
+            b = min(end_ms, a + MAX_KLINES * 60_000)
+            try:
+                frames.append(fetch_ohlcv(self.symbol, "1", limit=(b - a) // 60_000, category=self.category,
+                                          start=a, end=b - 1))
+            except RuntimeError:
+                pass  # no klines in this window
+            a = b
+        self.stats["fetched"] += 1
+
+        if frames:
+            df = pd.concat(frames)
+            df = df[~df.index.duplicated()].sort_index()
+            hl = np.vstack([df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float)])
+        else:
+            hl = np.empty((2, 0))
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.save(path, hl)
+        return hl[0], hl[1]
@@ -0,0 +1,171 @@
+# backtest/portfolio.py
+from __future__ import annotations
+from typing import Dict, List, Mapping, Optional, Union
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from strategy.base import Strategy
+from risk.manager import position_size, propose_levels
+from backtest.engine import BTConfig, _bps
+from backtest.exits import find_exit
+from backtest.records import TradeLog
+
+class Panel:
+    """
+    Columnar (time x symbol) OHLC arrays aligned on the union of all timestamps.
+    Arrays are Fortran-ordered so each symbol's column is contiguous in time
+    (the exit search scans one symbol at a time). Missing bars are NaN.
+    """
+    def __init__(self, frames: Mapping[str, pd.DataFrame]):
+        self.symbols: List[str] = list(frames)
+        index = None
+        for df in frames.values():
+            index = df.index if index is None else index.union(df.index)
+        self.index: pd.DatetimeIndex = index
+        T, S = len(index), len(self.symbols)
+
+        self.rows: Dict[str, np.ndarray] = {}  # symbol -> row positions of its bars in self.index
+        self.open = np.full((T, S), np.nan, order="F")
+        self.high = np.full((T, S), np.nan, order="F")
+        self.low = np.full((T, S), np.nan, order="F")
+        self.close = np.full((T, S), np.nan, order="F")
+        for s, (sym, df) in enumerate(frames.items()):
+            rows = index.get_indexer(df.index)
+            self.rows[sym] = rows
+            self.open[rows, s] = df["open"].to_numpy(dtype=float)
+            self.high[rows, s] = df["high"].to_numpy(dtype=float)
+            self.low[rows, s] = df["low"].to_numpy(dtype=float)
+            self.close[rows, s] = df["close"].to_numpy(dtype=float)
+
+def run_portfolio(
+    frames: Mapping[str, pd.DataFrame],
+    strategy: Union[Strategy, Mapping[str, Strategy]],
+    cfg: Optional[BTConfig] = None,
+    max_positions: Optional[int] = None,
+) -> Dict:
+    """
+    Multi-symbol backtest on one shared equity.
+    - frames: symbol -> OHLCV DataFrame (datetime index, oldest->newest)
+    - strategy: one Strategy for every symbol, or symbol -> Strategy (needs generate_signals)
+    Same fill rules as run_backtest per symbol: signal on bar t, entry at the open of the
+    symbol's own next bar (gaps and other symbols' extra timestamps are skipped over), SL/TP
+    checked from the entry bar on, SL wins ties. Every entry is sized with position_size()
+    off the shared equity at the signal bar; exits on a bar are booked before entries on it.
+    Work is event-driven: only signal bars and exit bars are visited in Python.
+    """
+    cfg = cfg or BTConfig()
+    panel = Panel(frames)
+    T, S = panel.close.shape
+
+    # ---- signals per symbol, scattered into the (time x symbol) grid ----
+    sig = np.zeros((T, S), dtype=np.int8, order="F")
+    atr = np.full((T, S), np.nan, order="F")
+    for s, sym in enumerate(panel.symbols):
+        strat = strategy[sym] if isinstance(strategy, Mapping) else strategy
+        batch = strat.generate_signals(frames[sym])
+        if batch is None:
+            raise TypeError(f"{type(strat).__name__} has no generate_signals(); the portfolio backtest needs it")
+        rows = panel.rows[sym]
+        codes = batch["signal"].to_numpy()
+        sig[rows, s] = np.where(codes == "LONG", 1, np.where(codes == "SHORT", -1, 0))
+        sig[rows[: max(strat.warmup(), 2)], s] = 0  # same first decision bar as run_backtest
+        atr[rows, s] = batch["atr14"].to_numpy(dtype=float)
+    own_rows = [panel.rows[sym] for sym in panel.symbols]
+    signal_bars = np.flatnonzero((sig[: T - 1] != 0).any(axis=1)) if T > 1 else np.array([], dtype=int)
+
+    # ---- per-symbol position state (vectors over symbols) ----
+    in_pos = np.zeros(S, dtype=bool)
+    side = np.zeros(S, dtype=np.int8)
+    entry_px = np.zeros(S)
+    qty = np.zeros(S)
+    sl_px = np.zeros(S)
+    tp_px = np.zeros(S)
+    entry_t = np.zeros(S, dtype=np.int64)
+
+    equity = cfg.initial_equity
+    eq_marks = np.full(T, np.nan)   # equity after exits, effective from the next bar
+    exits: list = []                # heap of (exit bar, symbol idx, reason)
+    trades = TradeLog(symbols=panel.symbols, tz=str(panel.index.tz) if panel.index.tz is not None else None)
+    n_open = 0
+
+    k = 0
+    while k < len(signal_bars) or exits:
+        t = min(signal_bars[k] if k < len(signal_bars) else T, exits[0][0] if exits else T)
+
+        # 1) exits scheduled on this bar
+        while exits and exits[0][0] == t:
+            _, s, reason = heapq.heappop(exits)
+            exit_px = sl_px[s] if reason == "SL" else tp_px[s]
+            slip = _bps(exit_px, cfg.slippage_bps)
+            fee = _bps(exit_px, cfg.fee_bps)
+            if side[s] == 1:
+                pnl_per_unit = (exit_px - entry_px[s]) - fee - slip
+            else:
+                pnl_per_unit = (entry_px[s] - exit_px) - fee - slip
+            trade_pnl = float(pnl_per_unit * qty[s])
+            equity += trade_pnl
+            if t + 1 < T:
+                eq_marks[t + 1] = equity
+            trades.append(
+                panel.index[entry_t[s]], panel.index[t],
+                "LONG" if side[s] == 1 else "SHORT", reason,
+                float(entry_px[s]), float(exit_px), float(qty[s]), trade_pnl, equity,
+                symbol=int(s),
+            )
+            in_pos[s] = False
+            n_open -= 1
+
+        # 2) entries for this bar's signals (filled at each symbol's next open)
+        if k < len(signal_bars) and signal_bars[k] == t:
+            k += 1
+            for s in np.flatnonzero((sig[t] != 0) & ~in_pos):
+                if max_positions is not None and n_open >= max_positions:
+                    break
+                rows = own_rows[s]
+                p = int(np.searchsorted(rows, t, side="right"))
+                if p >= len(rows):
+                    continue  # signal on the symbol's last bar
+                f = int(rows[p])  # the symbol's next bar
+                e_px = float(panel.open[f, s])
+                if np.isnan(e_px):
+                    continue
+                a = float(atr[t, s]) or float(panel.close[t, s] * 0.005)
+                pos_side = int(sig[t, s])
+                lvls = propose_levels(e_px, a, cfg.atr_mult_sl, cfg.atr_mult_tp,
+                                      side=("Buy" if pos_side == 1 else "Sell"))
+                stop_distance = abs(e_px - lvls["sl"])
+                if not stop_distance > 0:
+                    continue
+
+                fee = _bps(e_px, cfg.fee_bps)
+                slip = _bps(e_px, cfg.slippage_bps)
+                in_pos[s] = True
+                side[s] = pos_side
+                entry_px[s] = e_px + slip + fee if pos_side == 1 else e_px - slip - fee
+                qty[s] = position_size(equity, cfg.risk_pct, stop_distance)
+                sl_px[s] = lvls["sl"]
+                tp_px[s] = lvls["tp"]
+                entry_t[s] = f
+                n_open += 1
+
+                # schedule the exit now: first bar from entry that touches SL/TP
+                j, reason = find_exit(panel.high[:, s], panel.low[:, s], f, int(rows[-1]),
+                                      "LONG" if pos_side == 1 else "SHORT", sl_px[s], tp_px[s])
+                if j >= 0:
+                    heapq.heappush(exits, (j, s, reason))
+                # else: still open at the symbol's last bar (not marked, like run_backtest)
+
+    # stair-step curve: forward-fill the marks (equity is marked before a bar's exits)
+    if T:
+        eq_marks[0] = cfg.initial_equity
+        last_mark = np.maximum.accumulate(np.where(np.isnan(eq_marks), 0, np.arange(T)))
+        eq_marks = eq_marks[last_mark]
+    eq_series = pd.Series(eq_marks, index=panel.index)
+    return {
+        "trades": trades,
+        "equity_curve": eq_series,
+        "final_equity": equity,
+        "open_symbols": [panel.symbols[s] for s in np.flatnonzero(in_pos)],
+    }
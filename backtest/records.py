@@ -0,0 +1,136 @@
+# backtest/records.py
+from __future__ import annotations
+from typing import Dict, Iterator, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+SIDES = ("LONG", "SHORT")   # side code -> label
+REASONS = ("SL", "TP")      # reason code -> label
+
+TRADE_DTYPE = np.dtype([
+    ("entry_time", "M8[ns]"),
+    ("exit_time", "M8[ns]"),
+    ("symbol", "i4"),        # index into TradeLog.symbols (-1 = single-symbol run)
+    ("side", "i1"),
+    ("reason", "i1"),
+    ("entry_px", "f8"),
+    ("exit_px", "f8"),
+    ("qty", "f8"),
+    ("pnl", "f8"),
+    ("equity_after", "f8"),
+])
+
+class TradeLog:
+    """
+    Columnar trade log: one preallocated NumPy structured array (grown by doubling)
+    instead of a list of dicts. Columns are exposed as views (log["pnl"]), to_frame()
+    builds a DataFrame over them, and iterating still yields the old per-trade dicts.
+    """
+    __slots__ = ("_buf", "_n", "symbols", "tz")
+
+    def __init__(self, capacity: int = 64, symbols: Optional[Sequence[str]] = None, tz: Optional[str] = "UTC"):
+        self._buf = np.zeros(max(1, capacity), dtype=TRADE_DTYPE)
+        self._n = 0
+        self.symbols = tuple(symbols) if symbols else ()
+        self.tz = tz
+
+    def append(self, entry_time: pd.Timestamp, exit_time: pd.Timestamp, side: str, reason: str,
+               entry_px: float, exit_px: float, qty: float, pnl: float, equity_after: float,
+               symbol: int = -1) -> None:
+        if self._n == len(self._buf):
+            self._buf = np.resize(self._buf, 2 * len(self._buf))
+        self._buf[self._n] = (
+            entry_time.value, exit_time.value, symbol,
+            SIDES.index(side), REASONS.index(reason),
+            entry_px, exit_px, qty, pnl, equity_after,
+        )
+        self._n += 1
+
+    @property
+    def records(self) -> np.ndarray:
+        """Structured-array view of the trades (no copy)."""
+        return self._buf[: self._n]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.records[key]  # column view
+        if isinstance(key, slice):
+            return [self._as_dict(rec) for rec in self.records[key]]  # like the old list of dicts
+        return self._as_dict(self.records[key])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for rec in self.records:
+            yield self._as_dict(rec)
+
+    def _as_dict(self, rec) -> Dict:
+        out = {
+            "entry_time": self._ts(rec["entry_time"]),
+            "exit_time": self._ts(rec["exit_time"]),
+            "side": SIDES[rec["side"]],
+            "entry_px": float(rec["entry_px"]),
+            "exit_px": float(rec["exit_px"]),
+            "qty": float(rec["qty"]),
+            "reason": REASONS[rec["reason"]],
+            "pnl": float(rec["pnl"]),
+            "equity_after": float(rec["equity_after"]),
+        }
+        if self.symbols:
+            out = {"symbol": self.symbols[rec["symbol"]], **out}
+        return out
+
+    def _ts(self, v) -> pd.Timestamp:
+        # stored as UTC nanoseconds
+        return pd.Timestamp(v, tz="UTC").tz_convert(self.tz) if self.tz else pd.Timestamp(v)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the log; numeric columns are views of the structured array."""
+        rec = self.records
+        cols = {}
+        if self.symbols:
+            cols["symbol"] = pd.Categorical.from_codes(rec["symbol"], categories=list(self.symbols))
+        for name in ("entry_time", "exit_time"):
+            t = pd.DatetimeIndex(rec[name])
+            cols[name] = t.tz_localize("UTC").tz_convert(self.tz) if self.tz else t
+        cols["side"] = pd.Categorical.from_codes(rec["side"], categories=list(SIDES))
+        for name in ("entry_px", "exit_px", "qty"):
+            cols[name] = rec[name]
+        cols["reason"] = pd.Categorical.from_codes(rec["reason"], categories=list(REASONS))
+        for name in ("pnl", "equity_after"):
+            cols[name] = rec[name]
+        return pd.DataFrame(cols, copy=False)
+
+    @classmethod
+    def concat(cls, logs: Sequence["TradeLog"]) -> "TradeLog":
+        logs = list(logs)
+        if not logs:
+            return cls()
+        out = cls(symbols=logs[0].symbols, tz=logs[0].tz)
+        recs = np.concatenate([l.records for l in logs])
+        if len(recs):
+            out._buf = recs
+            out._n = len(recs)
+        return out
+
+    # pickle only the filled part (results are cached on disk)
+    def __getstate__(self):
+        return {"records": self.records.copy(), "symbols": self.symbols, "tz": self.tz}
+
+    def __setstate__(self, state):
+        self._buf = state["records"] if len(state["records"]) else np.zeros(1, dtype=TRADE_DTYPE)
+        self._n = len(state["records"])
+        self.symbols = state["symbols"]
+        self.tz = state["tz"]
+
+def trade_columns(trades) -> Dict[str, np.ndarray]:
+    """pnl / equity_after as arrays from a TradeLog, a structured array or a list of trade dicts."""
+    if isinstance(trades, TradeLog):
+        trades = trades.records
+    if isinstance(trades, np.ndarray):
+        return {"pnl": trades["pnl"], "equity_after": trades["equity_after"]}
+    return {
+        "pnl": np.array([t["pnl"] for t in trades], dtype=float),
+        "equity_after": np.array([t["equity_after"] for t in trades], dtype=float),
+    }
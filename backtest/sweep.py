@@ -0,0 +1,178 @@
+# backtest/sweep.py
+from __future__ import annotations
+from dataclasses import fields, replace
+from itertools import product
+from multiprocessing import Pool, shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Type
+import os
+
+import numpy as np
+import pandas as pd
+
+from strategy.base import Strategy
+from backtest.engine import run_backtest, BTConfig
+from analytics.metrics import summary_stats
+from backtest.cache import BacktestCache, frame_digest, result_key
+
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+# ---------- Grids ----------
+def expand_grid(grid: Optional[Dict[str, Sequence]]) -> List[Dict[str, Any]]:
+    """{"fast": [10, 20], "slow": [50]} -> [{"fast": 10, "slow": 50}, {"fast": 20, "slow": 50}]"""
+    if not grid:
+        return [{}]
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in product(*(grid[k] for k in keys))]
+
+def check_cfg_grid(cfg_grid: Optional[Dict[str, Sequence]]) -> None:
+    known = {f.name for f in fields(BTConfig)}
+    unknown = set(cfg_grid or {}) - known
+    if unknown:
+        raise ValueError(f"Unknown BTConfig fields in grid: {sorted(unknown)}")
+
+# ---------- Shared-memory OHLCV ----------
+class SharedOHLCV:
+    """
+    Puts an OHLCV frame into one shared-memory block (int64 ns timestamps + 5 float64 columns)
+    so pool workers map the same pages instead of each receiving a pickled copy.
+    """
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        self.n = n
+        self.tz = str(df.index.tz) if df.index.tz is not None else None
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * 8 * (1 + len(OHLCV))))
+        ts, cols = self._views(self.shm, n)
+        ts[:] = df.index.as_unit("ns").asi8
+        cols[:] = df[OHLCV].to_numpy(dtype=np.float64).T
+
+    @staticmethod
+    def _views(shm: shared_memory.SharedMemory, n: int):
+        ts = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+        cols = np.ndarray((len(OHLCV), n), dtype=np.float64, buffer=shm.buf, offset=n * 8)
+        return ts, cols
+
+    def spec(self) -> tuple:
+        return self.shm.name, self.n, self.tz
+
+    @classmethod
+    def attach(cls, spec: tuple):
+        """Worker side: returns (shm handle, zero-copy DataFrame). Keep the handle alive."""
+        name, n, tz = spec
+        shm = shared_memory.SharedMemory(name=name)
+        ts, cols = cls._views(shm, n)
+        cols.flags.writeable = False
+        index = pd.DatetimeIndex(ts.view("datetime64[ns]"), name="datetime")
+        if tz:
+            index = index.tz_localize(tz)
+        df = pd.DataFrame(cols.T, index=index, columns=OHLCV, copy=False)
+        return shm, df
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+# ---------- Worker side ----------
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(spec: tuple, cache_root: Optional[Path], data_digest: Optional[str]) -> None:
+    shm, df = SharedOHLCV.attach(spec)
+    _WORKER["shm"] = shm  # keep mapping alive for the life of the worker
+    _WORKER["df"] = df
+    _WORKER["cache"] = BacktestCache(cache_root) if cache_root else None
+    _WORKER["digest"] = data_digest
+
+def _run_task(task: tuple) -> List[Dict[str, Any]]:
+    """One strategy param set x a chunk of BTConfigs: signals are computed once (on the first cache miss)."""
+    strategy_cls, strat_params, base_cfg, cfg_chunk = task
+    df = _WORKER["df"]
+    cache = _WORKER["cache"]
+    strat = strategy_cls(**strat_params)
+    signals = None
+
+    out = []
+    for cfg_params in cfg_chunk:
+        cfg = replace(base_cfg, **cfg_params)
+        key = result_key(_WORKER["digest"], strat, cfg) if cache else None
+        res = cache.get(key) if cache else None
+        if res is None:
+            if signals is None:
+                signals = strat.generate_signals(df)
+            res = run_backtest(df, strat, cfg, signals=signals)
+            if cache:
+                cache.put(key, res)
+        stats = summary_stats(res["trades"], res["equity_curve"])
+        out.append({**strat_params, **cfg_params, **stats})
+    return out
+
+# ---------- Driver ----------
+def run_sweep(
+    df: pd.DataFrame,
+    strategy_cls: Type[Strategy],
+    strat_grid: Dict[str, Sequence],
+    cfg_grid: Optional[Dict[str, Sequence]] = None,
+    base_cfg: Optional[BTConfig] = None,
+    workers: Optional[int] = None,
+    cfg_chunk: int = 16,
+    rank_by: str = "final_equity",
+    ascending: bool = False,
+    out_csv: Optional[Path] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cache_root: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Grid search over strategy params x BTConfig fields on a process pool.
+    - df is shared with the workers through shared memory (not pickled per task)
+    - each result row = params + summary_stats(); rows are appended to out_csv and
+      passed to on_result as they arrive
+    - cache_root: reuse/store run_backtest results in a BacktestCache there
+    Returns all rows ranked by rank_by.
+    """
+    check_cfg_grid(cfg_grid)
+    base_cfg = base_cfg or BTConfig()
+    cfgs = expand_grid(cfg_grid)
+
+    # drop invalid strategy combos (e.g. SmaCross fast >= slow) before shipping them out
+    strat_params = []
+    for p in expand_grid(strat_grid):
+        try:
+            strategy_cls(**p)
+        except (AssertionError, ValueError):
+            continue
+        strat_params.append(p)
+
+    tasks = [
+        (strategy_cls, p, base_cfg, cfgs[i:i + cfg_chunk])
+        for p in strat_params
+        for i in range(0, len(cfgs), cfg_chunk)
+    ]
+
+    rows: List[Dict[str, Any]] = []
+    if out_csv:
+        Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+    header_written = False
+
+    digest = frame_digest(df) if cache_root else None  # hash the candles once, not per run
+    shared = SharedOHLCV(df)
+    try:
+        with Pool(processes=workers or os.cpu_count(), initializer=_init_worker,
+                  initargs=(shared.spec(), cache_root, digest)) as pool:
+            for chunk in pool.imap_unordered(_run_task, tasks):
+                rows.extend(chunk)
+                if out_csv:
+                    pd.DataFrame(chunk).to_csv(out_csv, mode="a" if header_written else "w",
+                                               header=not header_written, index=False)
+                    header_written = True
+                if on_result:
+                    for r in chunk:
+                        on_result(r)
+    finally:
+        shared.close()
+
+    return rank_results(rows, rank_by, ascending)
+
+def rank_results(rows: Iterable[Dict[str, Any]], rank_by: str = "final_equity", ascending: bool = False) -> pd.DataFrame:
+    table = pd.DataFrame(list(rows))
+    if table.empty:
+        return table
+    return table.sort_values(rank_by, ascending=ascending, kind="stable").reset_index(drop=True)
@@ -0,0 +1,125 @@
+# backtest/walkforward.py
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import pandas as pd
+
+from strategy.base import Strategy
+from backtest.engine import run_backtest, BTConfig
+from backtest.sweep import expand_grid, check_cfg_grid
+from backtest.records import TradeLog
+from analytics.metrics import summary_stats
+
+@dataclass
+class WFConfig:
+    in_sample: int = 2000           # bars used to pick params
+    out_sample: int = 500           # bars traded with the winner
+    step: Optional[int] = None      # how far windows roll (>= out_sample); default = out_sample (OOS windows tile)
+    rank_by: str = "final_equity"   # summary_stats key to optimize
+    ascending: bool = False         # True for "lower is better" keys (e.g. max_dd)
+
+def make_folds(n: int, wf: WFConfig) -> List[Tuple[int, int, int]]:
+    """[(is_start, oos_start, oos_end), ...] as bar positions; is_end == oos_start."""
+    step = wf.step or wf.out_sample
+    if step < wf.out_sample:
+        # overlapping OOS windows would trade (and stitch) the same bars twice
+        raise ValueError(f"step ({step}) must be >= out_sample ({wf.out_sample})")
+    folds = []
+    is_start = 0
+    while is_start + wf.in_sample < n:
+        oos_start = is_start + wf.in_sample
+        folds.append((is_start, oos_start, min(oos_start + wf.out_sample, n)))
+        is_start += step
+    return folds
+
+def _run_window(df: pd.DataFrame, signals: pd.DataFrame, strat: Strategy, cfg: BTConfig,
+                start: int, end: int) -> Dict:
+    """
+    Backtest bars [start, end) reusing the full-history signals. The slice starts `lead`
+    bars early so run_backtest's warmup skip lands exactly on `start`; indicators are
+    already warm because they were computed once over the whole frame.
+    """
+    lead = min(start, max(strat.warmup(), 2))
+    a = start - lead
+    return run_backtest(df.iloc[a:end], strat, cfg, signals=signals.iloc[a:end])
+
+def walk_forward(
+    df: pd.DataFrame,
+    strategy_cls: Type[Strategy],
+    strat_grid: Dict[str, Sequence],
+    cfg_grid: Optional[Dict[str, Sequence]] = None,
+    base_cfg: Optional[BTConfig] = None,
+    wf: Optional[WFConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Rolling in-sample optimisation + out-of-sample evaluation.
+    Signals (and the indicators behind them) are computed once per strategy param set over
+    the full history and then sliced per window, instead of being recomputed for every fold.
+    Positions still open at the end of an OOS window are not carried into the next one.
+    Returns the stitched OOS equity curve, OOS trades and per-fold stats.
+    """
+    check_cfg_grid(cfg_grid)
+    wf = wf or WFConfig()
+    base_cfg = base_cfg or BTConfig()
+    cfgs = expand_grid(cfg_grid)
+
+    # one signal pass per param set, shared by every fold
+    candidates = []
+    for p in expand_grid(strat_grid):
+        try:
+            strat = strategy_cls(**p)
+        except (AssertionError, ValueError):
+            continue
+        signals = strat.generate_signals(df)
+        if signals is None:
+            raise TypeError(f"{strategy_cls.__name__} has no generate_signals(); walk-forward needs it")
+        candidates.append((p, strat, signals))
+
+    equity = base_cfg.initial_equity
+    curves: List[pd.Series] = []
+    logs: List[TradeLog] = []
+    fold_rows: List[Dict[str, Any]] = []
+
+    for k, (is_start, oos_start, oos_end) in enumerate(make_folds(len(df), wf)):
+        # 1) optimise on the in-sample window
+        best = None
+        for p, strat, signals in candidates:
+            for c in cfgs:
+                cfg = replace(base_cfg, **c)
+                res = _run_window(df, signals, strat, cfg, is_start, oos_start)
+                stats = summary_stats(res["trades"], res["equity_curve"])
+                score = stats[wf.rank_by]
+                better = best is None or (score < best[0] if wf.ascending else score > best[0])
+                if better:
+                    best = (score, p, strat, signals, c, stats)
+        if best is None:
+            break
+        _, p, strat, signals, c, is_stats = best
+
+        # 2) trade the winner out-of-sample, compounding from the running equity
+        oos_cfg = replace(replace(base_cfg, **c), initial_equity=equity)
+        res = _run_window(df, signals, strat, oos_cfg, oos_start, oos_end)
+        oos_stats = summary_stats(res["trades"], res["equity_curve"])
+        equity = res["final_equity"]
+        curves.append(res["equity_curve"])
+        logs.append(res["trades"])
+
+        fold_rows.append({
+            "fold": k,
+            "is_start": df.index[is_start],
+            "oos_start": df.index[oos_start],
+            "oos_end": df.index[oos_end - 1],
+            **p,
+            **c,
+            **{f"is_{key}": v for key, v in is_stats.items()},
+            **{f"oos_{key}": v for key, v in oos_stats.items()},
+        })
+
+    eq = pd.concat(curves) if curves else pd.Series(dtype=float)
+    return {
+        "equity_curve": eq,
+        "trades": TradeLog.concat(logs),
+        "folds": pd.DataFrame(fold_rows),
+        "final_equity": equity,
+    }
@@ -0,0 +1,203 @@
+# bench/suite.py
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import synthetic_ohlcv
+from data.market_data import add_sma, add_ema, add_rsi, add_atr
+from strategy.sma_cross import SmaCross
+from backtest.engine import run_backtest, BTConfig
+from paper.runner import PaperRunner, PaperConfig
+from data.indicator_cache import DEFAULT_CACHE
+
+SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+@dataclass
+class BenchCase:
+    name: str
+    fn: Callable[[pd.DataFrame], Any]   # the timed call; gets the synthetic frame
+
+def _uncached(fn: Callable[[pd.DataFrame], Any]) -> Callable[[pd.DataFrame], Any]:
+    # strategies/runners go through the process-wide indicator cache: empty it on every call so
+    # warmup and earlier repeats don't turn the measured runs into cache hits
+    def run(df: pd.DataFrame) -> Any:
+        DEFAULT_CACHE.clear()
+        return fn(df)
+    return run
+
+def _replay(df: pd.DataFrame) -> None:
+    # trades are appended to a throwaway report so the timing includes the CSV writes
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = PaperConfig(report_path=Path(tmp) / "trades.csv")
+        PaperRunner(SmaCross(fast=20, slow=50), cfg).run_replay(df=df)
+
+CASES: List[BenchCase] = [
+    BenchCase("indicators.add_sma", lambda df: add_sma(df, 50)),
+    BenchCase("indicators.add_ema", lambda df: add_ema(df, 20)),
+    BenchCase("indicators.add_rsi", lambda df: add_rsi(df, 14)),
+    BenchCase("indicators.add_atr", lambda df: add_atr(df, 14)),
+    BenchCase("strategy.generate_signal", _uncached(lambda df: SmaCross(fast=20, slow=50).generate_signal(df))),
+    BenchCase("strategy.generate_signals", _uncached(lambda df: SmaCross(fast=20, slow=50).generate_signals(df))),
+    BenchCase("backtest.run_backtest", _uncached(lambda df: run_backtest(df, SmaCross(fast=20, slow=50), BTConfig()))),
+    BenchCase("paper.run_replay", _uncached(_replay)),
+]
+
+def select_cases(patterns: Optional[Sequence[str]] = None) -> List[BenchCase]:
+    """Cases whose name matches any glob pattern (all cases if none given)."""
+    if not patterns:
+        return list(CASES)
+    out = [c for c in CASES if any(fnmatch.fnmatch(c.name, p) for p in patterns)]
+    if not out:
+        raise ValueError(f"No benchmark case matches {list(patterns)}; have {[c.name for c in CASES]}")
+    return out
+
+def measure(fn: Callable[[], Any], repeat: int = 3, warmup: int = 1, memory: bool = True,
+            budget_s: float = 30.0) -> Dict[str, Any]:
+    """
+    Time fn() `repeat` times with perf_counter (after `warmup` untimed calls), then run it once
+    more under tracemalloc for the peak traced allocation. Calls slower than budget_s stop the
+    repeats early, so multi-million-bar runs of slow paths are timed once instead of N times.
+    Timing runs are never traced (tracemalloc slows Python code down several-fold).
+    """
+    for _ in range(warmup):
+        t0 = time.perf_counter()
+        fn()
+        if time.perf_counter() - t0 > budget_s:
+            break
+    times: List[float] = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if times[-1] > budget_s:
+            break
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / 2**20
+
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "runs": len(times),
+        "peak_mb": peak_mb,
+    }
+
+def run_suite(
+    sizes: Sequence[int] = SIZES,
+    cases: Optional[Sequence[BenchCase]] = None,
+    seed: int = 0,
+    repeat: int = 3,
+    warmup: int = 1,
+    memory: bool = True,
+    budget_s: float = 30.0,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every case at every size on the same seeded frame; returns one history record."""
+    cases = list(CASES) if cases is None else list(cases)
+    results: List[Dict[str, Any]] = []
+    for n in sizes:
+        df = synthetic_ohlcv(n, seed=seed)
+        for case in cases:
+            row = {"case": case.name, "bars": int(n),
+                   **measure(lambda: case.fn(df), repeat=repeat, warmup=warmup, memory=memory, budget_s=budget_s)}
+            results.append(row)
+            if on_result:
+                on_result(row)
+        del df
+        gc.collect()
+    return {**run_meta(), "seed": seed, "results": results}
+
+def run_meta() -> Dict[str, Any]:
+    """Where/what was measured, so history entries stay comparable."""
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    return {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": rev,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)",
+    }
+
+# ---------- history / baseline ----------
+
+def load_json(path: Path) -> Any:
+    return json.loads(Path(path).read_text())
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    return load_json(path) if Path(path).exists() else []
+
+def append_history(path: Path, record: Dict[str, Any]) -> None:
+    """Append one run to the JSON history file (rewritten atomically)."""
+    path = Path(path)
+    history = load_history(path)
+    history.append(record)
+    save_json(path, history)
+
+def save_json(path: Path, obj: Any) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(obj, indent=2))
+    os.replace(tmp, path)
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.15,
+            mem_threshold: float = 0.25, min_delta_s: float = 0.005) -> pd.DataFrame:
+    """
+    Per (case, bars) ratio of current vs baseline median time and peak memory.
+    status: "REGRESSION" if time grew by more than threshold (and by at least min_delta_s,
+    so sub-millisecond noise never trips it) or memory by more than mem_threshold;
+    "faster" if time shrank by more than threshold; "new" if the baseline lacks the row.
+    """
+    base = {(r["case"], r["bars"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current.get("results", []):
+        b = base.get((r["case"], r["bars"]))
+        row = {"case": r["case"], "bars": r["bars"], "base_s": None, "cur_s": r["median_s"],
+               "time_ratio": None, "base_mb": None, "cur_mb": r.get("peak_mb"), "mem_ratio": None,
+               "status": "new"}
+        if b is not None:
+            row["base_s"] = b["median_s"]
+            row["time_ratio"] = r["median_s"] / b["median_s"] if b["median_s"] > 0 else None
+            slower = (row["time_ratio"] is not None and row["time_ratio"] > 1.0 + threshold
+                      and r["median_s"] - b["median_s"] >= min_delta_s)
+            if b.get("peak_mb") and r.get("peak_mb") is not None:
+                row["base_mb"] = b["peak_mb"]
+                row["mem_ratio"] = r["peak_mb"] / b["peak_mb"]
+            fatter = row["mem_ratio"] is not None and row["mem_ratio"] > 1.0 + mem_threshold
+            if slower or fatter:
+                row["status"] = "REGRESSION"
+            elif row["time_ratio"] is not None and row["time_ratio"] < 1.0 - threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return pd.DataFrame(rows)
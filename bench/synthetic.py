@@ -0,0 +1,27 @@
+# bench/synthetic.py
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+from data.market_data import interval_ms
+
+def synthetic_ohlcv(n: int, seed: int = 0, interval: str = "15", start: str = "2020-01-01",
+                    price: float = 30_000.0, vol: float = 0.004) -> pd.DataFrame:
+    """
+    Seeded random-walk candles shaped like fetch_ohlcv() output
+    (UTC DatetimeIndex, float64 open/high/low/close/volume), so benchmarks need no network.
+    Same (n, seed, interval) -> identical frame.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0.0, vol, n)))
+    open_ = np.empty(n)
+    open_[:1] = price
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.normal(0.0, vol * 0.75, n)) * close
+    high = np.maximum(open_, close) + wick * rng.random(n)
+    low = np.minimum(open_, close) - wick * rng.random(n)
+    volume = rng.random(n) * 100.0
+    index = pd.date_range(start, periods=n, freq=pd.Timedelta(milliseconds=interval_ms(interval)),
+                          tz="UTC", name="datetime")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+                        index=index)
@@ -0,0 +1,47 @@
+# cli/backfill.py
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from data.backfill import Backfill, DEFAULT_RATE
+from exchange.ratelimit import TokenBucket
+from exchange.registry import get_client
+
+def _fmt(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+def main():
+    ap = argparse.ArgumentParser(description="Download candle history into the local store (resumable)")
+    ap.add_argument("--symbols", default="BTCUSDT", help="comma list, e.g. BTCUSDT,ETHUSDT")
+    ap.add_argument("--tf", default="1", help="Bybit interval string: 1,3,5,15,30,60,240,D")
+    ap.add_argument("--category", default="linear")
+    ap.add_argument("--start", required=True, help="e.g. 2022-01-01")
+    ap.add_argument("--end", default=None, help="default: now")
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Max requests/s across all workers")
+    args = ap.parse_args()
+
+    # one rate limit, thread pool and HTTP session shared by every symbol
+    bucket = TokenBucket(args.rate)
+    client = get_client(category=args.category)
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for sym in [s.strip() for s in args.symbols.split(",") if s.strip()]:
+            print(f"Backfilling {sym} {args.tf}m from {args.start}...")
+
+            def progress(done, total):
+                if done % 100 == 0 or done == total:
+                    print(f"  {done}/{total} windows")
+
+            bf = Backfill(sym, args.tf, args.category, bucket=bucket, client=client)
+            rep = bf.run(args.start, args.end, executor=pool, on_window=progress)
+            print(f"  {rep['bars']} bars stored in range (+{rep['rows_added']} new), "
+                  f"{rep['fetched']} fetched / {rep['empty']} empty / {rep['resumed']} resumed windows, "
+                  f"{rep['seconds']:.1f}s")
+            if rep["failed"]:
+                print(f"  {rep['failed']} windows failed; re-run the same command to retry them")
+            for a, b, missing in rep["gaps"][:10]:
+                print(f"  gap: {_fmt(a)} -> {_fmt(b)} ({missing} bars missing)")
+            if len(rep["gaps"]) > 10:
+                print(f"  ... {len(rep['gaps']) - 10} more gaps")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# cli/backtest_portfolio.py
+import argparse
+from pathlib import Path
+from data.store import load_ohlcv
+from strategy.sma_cross import SmaCross
+from backtest.engine import BTConfig
+from backtest.portfolio import run_portfolio
+from analytics.metrics import summary_stats
+
+def main():
+    ap = argparse.ArgumentParser(description="Multi-symbol SMA-cross backtest on one shared equity")
+    ap.add_argument("--symbols", default="BTCUSDT,ETHUSDT,SOLUSDT", help="comma list of USDT perps")
+    ap.add_argument("--tf", default="15", help="Bybit interval string: 1,3,5,15,30,60,240,D")
+    ap.add_argument("--limit", type=int, default=1000)
+    ap.add_argument("--risk", type=float, default=0.005, help="Risk % of shared equity per entry")
+    ap.add_argument("--max-pos", type=int, default=None, help="Max concurrent positions")
+    args = ap.parse_args()
+
+    frames = {}
+    for sym in [s.strip() for s in args.symbols.split(",") if s.strip()]:
+        print(f"Loading {sym} {args.tf}m candles (syncing local store)...")
+        frames[sym] = load_ohlcv(sym, interval=args.tf, limit=args.limit)
+
+    cfg = BTConfig(initial_equity=2000.0, risk_pct=args.risk)
+    res = run_portfolio(frames, SmaCross(fast=20, slow=50), cfg, max_positions=args.max_pos)
+    trades = res["trades"].to_frame()
+
+    print("\n=== Portfolio ===")
+    for k, v in summary_stats(res["trades"], res["equity_curve"]).items():
+        print(f"{k}: {v}")
+    if len(trades):
+        per_sym = trades.groupby("symbol", observed=True)["pnl"].agg(["count", "sum"])
+        print("\n=== Per symbol ===")
+        print(per_sym.to_string())
+
+    Path("reports").mkdir(exist_ok=True)
+    trades_path = Path(f"reports/portfolio_{args.tf}m_trades.csv")
+    eq_path = Path(f"reports/portfolio_{args.tf}m_equity.csv")
+    trades.to_csv(trades_path, index=False)
+    res["equity_curve"].to_csv(eq_path, header=["equity"])
+    print(f"\nSaved: {trades_path}")
+    print(f"Saved: {eq_path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 # cli/backtest_sma.py
 from pathlib import Path
-import pandas as pd
-from data.market_data import fetch_ohlcv
+from data.store import load_ohlcv
 from strategy.sma_cross import SmaCross
-from backtest.engine import run_backtest, BTConfig
+from backtest.engine import BTConfig
+from backtest.cache import cached_backtest
 from analytics.metrics import summary_stats
 
 def main():
@@ -11,8 +11,8 @@ def main():
     interval = "15"
     limit = 2000  # ~enough for many months
 
-    print(f"Fetching {symbol} {interval}m candles...")
-    df = fetch_ohlcv(symbol, interval=interval, limit=limit)
+    print(f"Loading {symbol} {interval}m candles (syncing local store)...")
+    df = load_ohlcv(symbol, interval=interval, limit=limit)
 
     strat = SmaCross(fast=20, slow=50)
     cfg = BTConfig(
@@ -25,7 +25,7 @@ def main():
     )
 
     print("Running backtest...")
-    result = run_backtest(df, strat, cfg)
+    result = cached_backtest(df, strat, cfg)  # instant on repeat runs with the same candles/params
     trades = result["trades"]
     eq = result["equity_curve"]
 
@@ -38,7 +38,7 @@ def main():
     Path("reports").mkdir(exist_ok=True)
     trades_path = Path(f"reports/{symbol}_{interval}m_sma_trades.csv")
     eq_path = Path(f"reports/{symbol}_{interval}m_sma_equity.csv")
-    pd.DataFrame(trades).to_csv(trades_path, index=False)
+    trades.to_frame().to_csv(trades_path, index=False)
     eq.to_csv(eq_path, header=["equity"])
     print(f"\nSaved: {trades_path}")
     print(f"Saved: {eq_path}")
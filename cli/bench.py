@@ -0,0 +1,84 @@
+# cli/bench.py
+import argparse
+import sys
+from pathlib import Path
+from bench.suite import SIZES, select_cases, run_suite, load_history, load_json, append_history, save_json, compare
+
+HISTORY = Path("reports/bench/history.json")
+BASELINE = Path("reports/bench/baseline.json")
+
+def _sizes(s: str) -> list:
+    """'10k,100k,1M' -> [10000, 100000, 1000000]"""
+    mult = {"k": 1_000, "m": 1_000_000}
+    out = []
+    for x in s.split(","):
+        x = x.strip().lower()
+        if x:
+            out.append(int(float(x[:-1]) * mult[x[-1]]) if x[-1] in mult else int(x))
+    return out
+
+def cmd_run(args):
+    cases = select_cases(args.cases)
+
+    def progress(row):
+        mem = f"{row['peak_mb']:9.1f} MB" if row["peak_mb"] is not None else ""
+        print(f"  {row['case']:<28} {row['bars']:>9,} bars  {row['median_s']:9.4f} s  {mem}")
+
+    print(f"Benchmarking {len(cases)} cases x {len(args.sizes)} sizes (seed={args.seed})...")
+    record = run_suite(args.sizes, cases, seed=args.seed, repeat=args.repeat, warmup=args.warmup,
+                       memory=not args.no_memory, budget_s=args.budget, on_result=progress)
+    append_history(args.history, record)
+    print(f"\nAppended to {args.history}")
+    if args.save_baseline:
+        save_json(args.baseline, record)
+        print(f"Saved baseline: {args.baseline}")
+
+def cmd_compare(args):
+    history = load_history(args.history)
+    if not history:
+        sys.exit(f"No runs in {args.history}; run `python -m cli.bench run` first")
+    if not args.baseline.exists():
+        sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first")
+    baseline = load_json(args.baseline)
+    current = history[args.run]
+
+    table = compare(current, baseline, threshold=args.threshold, mem_threshold=args.mem_threshold)
+    print(f"=== {current.get('git_rev')} ({current.get('time')}) vs baseline "
+          f"{baseline.get('git_rev')} ({baseline.get('time')}) ===")
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    regressions = table[table["status"] == "REGRESSION"]
+    if len(regressions):
+        print(f"\n{len(regressions)} regression(s) over +{args.threshold:.0%} time / +{args.mem_threshold:.0%} memory")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmarks for the backtest / replay / indicator hot paths")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="Run the suite and append the results to the history file")
+    run.add_argument("--sizes", type=_sizes, default=list(SIZES), help="comma list, e.g. 10k,100k,1M,5M")
+    run.add_argument("--cases", nargs="*", default=None, help="glob patterns, e.g. 'indicators.*' backtest.run_backtest")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--budget", type=float, default=30.0, help="Stop repeating a case once one call takes longer (s)")
+    run.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    run.add_argument("--history", type=Path, default=HISTORY)
+    run.add_argument("--baseline", type=Path, default=BASELINE)
+    run.add_argument("--save-baseline", action="store_true", help="Also store this run as the baseline")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Compare a history run against the baseline; exit 1 on regression")
+    cmp_.add_argument("--history", type=Path, default=HISTORY)
+    cmp_.add_argument("--baseline", type=Path, default=BASELINE)
+    cmp_.add_argument("--run", type=int, default=-1, help="History entry to check (default: latest)")
+    cmp_.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown (0.15 = +15%%)")
+    cmp_.add_argument("--mem-threshold", type=float, default=0.25, help="Allowed peak-memory growth")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 import argparse
 from exec.live_runner import LiveRunner, LiveConfig
 from strategy.sma_cross import SmaCross
+from data.feed import WsKlineFeed
 
 def main():
     ap = argparse.ArgumentParser(description="Live trading runner (TESTNET)")
@@ -11,6 +12,7 @@ def main():
     ap.add_argument("--slatr", type=float, default=1.0, help="Stop at N x ATR")
     ap.add_argument("--tpatr", type=float, default=2.0, help="Take-profit at N x ATR")
     ap.add_argument("--equity", type=float, default=2000.0, help="Sizing equity hint (USDT)")
+    ap.add_argument("--ws", action="store_true", help="React to bar closes from the kline WebSocket instead of polling")
     args = ap.parse_args()
 
     strat = SmaCross(fast=20, slow=50)
@@ -22,7 +24,8 @@ def main():
         atr_mult_tp=args.tpatr,
         equity_hint=args.equity,
     )
-    runner = LiveRunner(strategy=strat, cfg=cfg)
+    feed = WsKlineFeed(args.symbol, args.tf, cfg.category) if args.ws else None
+    runner = LiveRunner(strategy=strat, cfg=cfg, feed=feed)
     runner.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+# cli/montecarlo.py
+import argparse
+from pathlib import Path
+import pandas as pd
+from analytics.montecarlo import monte_carlo, summarize
+
+def main():
+    ap = argparse.ArgumentParser(description="Monte Carlo resampling of a backtest trade list")
+    ap.add_argument("trades_csv", help="trades CSV saved by a backtest (needs pnl and equity_after)")
+    ap.add_argument("--paths", type=int, default=10_000)
+    ap.add_argument("--method", choices=["bootstrap", "permutation"], default="bootstrap")
+    ap.add_argument("--ruin", type=float, default=0.5, help="Ruin = losing this fraction of starting equity")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+
+    trades = pd.read_csv(Path(args.trades_csv)).to_dict("records")
+    if not trades:
+        print("No trades in file.")
+        return
+
+    mc = monte_carlo(trades, n_paths=args.paths, method=args.method, ruin_pct=args.ruin, seed=args.seed)
+    print(f"=== Monte Carlo ({args.method}, {args.paths} paths, {len(trades)} trades) ===")
+    print(summarize(mc).to_string(float_format=lambda v: f"{v:,.2f}"))
+    print(f"\nRisk of ruin (-{args.ruin:.0%}): {mc['risk_of_ruin']:.2%}")
+
+if __name__ == "__main__":
+    main()
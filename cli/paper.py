@@ -2,6 +2,7 @@
 import argparse
 from paper.runner import PaperRunner, PaperConfig
 from strategy.sma_cross import SmaCross
+from data.feed import WsKlineFeed, ReplayFeed
 
 def parse_hours_to_bars(hours: int, tf_minutes: int) -> int:
     bars = max(100, int((hours * 60) / tf_minutes))  # at least 100 bars for warmup
@@ -14,6 +15,10 @@ def main():
     ap.add_argument("--tf", default="15", help="Bybit interval minutes: 1,3,5,15,30,60,240, ... as string")
     ap.add_argument("--lookback", default="72h", help="Replay lookback, e.g. 24h, 72h, 7d")
     ap.add_argument("--risk", type=float, default=0.01, help="Risk % per trade, e.g. 0.01 for 1%")
+    ap.add_argument("--intrabar", action="store_true", help="Resolve bars hitting both SL and TP from 1m candles")
+    ap.add_argument("--ws", action="store_true", help="Live: react to bar closes from the kline WebSocket instead of polling")
+    ap.add_argument("--feed-file", default=None, help="Live: replay candles from a CSV (offline stand-in for --ws)")
+    ap.add_argument("--speed", type=float, default=None, help="--feed-file playback speed (x real time; default: as fast as possible)")
     args = ap.parse_args()
 
     # Strategy (you can swap later)
@@ -23,6 +28,7 @@ def main():
         symbol=args.symbol,
         interval=args.tf,
         risk_pct=args.risk,
+        intrabar=args.intrabar,
     )
     runner = PaperRunner(strategy=strat, cfg=cfg)
 
@@ -41,8 +47,13 @@ def main():
         runner.run_replay(lookback_bars=bars)
         print("Replay finished. See reports/paper_trades.csv")
     else:
+        feed = None
+        if args.feed_file:
+            feed = ReplayFeed(args.feed_file, args.symbol, args.tf, speed=args.speed)
+        elif args.ws:
+            feed = WsKlineFeed(args.symbol, args.tf, cfg.category)
         print(f"Starting LIVE paper mode on {args.symbol} {args.tf}m (Ctrl+C to stop)")
-        runner.run_live()
+        runner.run_live(feed=feed)
 
 if __name__ == "__main__":
     main()
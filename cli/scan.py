@@ -0,0 +1,55 @@
+# cli/scan.py
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from data.async_fetch import AsyncMarketData, to_panel, DEFAULT_CONCURRENCY, DEFAULT_RATE
+
+async def scan(args):
+    async with AsyncMarketData(args.category, args.concurrency, args.rate) as md:
+        t0 = time.perf_counter()
+        if args.symbols:
+            syms = [s.strip() for s in args.symbols.split(",") if s.strip()]
+        else:
+            syms = await md.symbols(quote=args.quote)
+        frames, tickers = await asyncio.gather(md.klines_many(syms, args.tf, args.limit), md.tickers(syms))
+        elapsed = time.perf_counter() - t0
+        print(f"{len(frames)}/{len(syms)} symbols, {args.limit} x {args.tf}m bars + tickers "
+              f"in {elapsed:.1f}s ({md.stats['requests']} requests)")
+        for sym, e in md.errors.items():
+            print(f"  failed {sym}: {e}")
+        return frames, tickers
+
+def main():
+    ap = argparse.ArgumentParser(description="Fetch klines + tickers for many symbols concurrently")
+    ap.add_argument("--symbols", default=None, help="comma list; default: every trading symbol of the category")
+    ap.add_argument("--category", default="linear")
+    ap.add_argument("--quote", default="USDT", help="with no --symbols: only this quote coin")
+    ap.add_argument("--tf", default="15", help="Bybit interval string: 1,3,5,15,30,60,240,D")
+    ap.add_argument("--limit", type=int, default=200, help="Bars per symbol")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max requests in flight")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Max requests/s")
+    ap.add_argument("--top", type=int, default=15, help="Show the N biggest movers over the window")
+    ap.add_argument("--save", action="store_true", help="Save the close panel to reports/scan_<tf>m_close.csv")
+    args = ap.parse_args()
+
+    frames, tickers = asyncio.run(scan(args))
+    if not frames:
+        return
+    close = to_panel(frames, "close")
+    change = (close.ffill().iloc[-1] / close.bfill().iloc[0] - 1).rename("change")
+    table = change.to_frame()
+    if "turnover24h" in tickers.columns:
+        table["turnover24h"] = tickers["turnover24h"]
+    table = table.reindex(change.abs().sort_values(ascending=False).index)
+    print(f"\nTop {args.top} movers over the last {args.limit} bars:")
+    print(table.head(args.top).to_string(float_format=lambda x: f"{x:,.4f}"))
+
+    if args.save:
+        Path("reports").mkdir(exist_ok=True)
+        out = Path(f"reports/scan_{args.tf}m_close.csv")
+        close.to_csv(out)
+        print("Saved:", out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# cli/sweep_sma.py
+import argparse
+from pathlib import Path
+from data.store import load_ohlcv
+from data.resample import load_resampled
+from strategy.sma_cross import SmaCross
+from backtest.sweep import run_sweep
+
+def _ints(s: str) -> list:
+    return [int(x) for x in s.split(",") if x]
+
+def _floats(s: str) -> list:
+    return [float(x) for x in s.split(",") if x]
+
+def main():
+    ap = argparse.ArgumentParser(description="Parallel SMA-cross parameter sweep")
+    ap.add_argument("--symbol", default="BTCUSDT")
+    ap.add_argument("--tf", default="15", help="Bybit interval string: 1,3,5,15,30,60,240,D")
+    ap.add_argument("--limit", type=int, default=2000)
+    ap.add_argument("--fast", type=_ints, default=[10, 20, 30], help="comma list, e.g. 10,20,30")
+    ap.add_argument("--slow", type=_ints, default=[50, 100, 200])
+    ap.add_argument("--slatr", type=_floats, default=[1.0, 1.5, 2.0])
+    ap.add_argument("--tpatr", type=_floats, default=[2.0, 3.0, 4.0])
+    ap.add_argument("--risk", type=_floats, default=[0.01])
+    ap.add_argument("--fee", type=_floats, default=[2.0], help="fee_bps per side")
+    ap.add_argument("--slip", type=_floats, default=[1.0], help="slippage_bps per side")
+    ap.add_argument("--workers", type=int, default=None, help="default: all cores")
+    ap.add_argument("--rank", default="final_equity", help="summary_stats column to rank by")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--no-cache", action="store_true", help="Don't reuse cached backtest results")
+    ap.add_argument("--from-1m", action="store_true", help="Derive --tf bars from the stored 1m candles")
+    args = ap.parse_args()
+
+    print(f"Loading {args.symbol} {args.tf}m candles (syncing local store)...")
+    if args.from_1m:
+        df = load_resampled(args.symbol, interval=args.tf, limit=args.limit)
+    else:
+        df = load_ohlcv(args.symbol, interval=args.tf, limit=args.limit)
+
+    out = Path(f"reports/{args.symbol}_{args.tf}m_sma_sweep.csv")
+    done = [0]
+
+    def progress(_row):
+        done[0] += 1
+        if done[0] % 100 == 0:
+            print(f"  {done[0]} runs done")
+
+    table = run_sweep(
+        df,
+        SmaCross,
+        strat_grid={"fast": args.fast, "slow": args.slow},
+        cfg_grid={
+            "atr_mult_sl": args.slatr,
+            "atr_mult_tp": args.tpatr,
+            "risk_pct": args.risk,
+            "fee_bps": args.fee,
+            "slippage_bps": args.slip,
+        },
+        workers=args.workers,
+        rank_by=args.rank,
+        out_csv=out,
+        on_result=progress,
+        cache_root=None if args.no_cache else Path("storage/bt_cache"),
+    )
+
+    print(f"\n=== Top {args.top} by {args.rank} ({len(table)} runs) ===")
+    print(table.head(args.top).to_string(index=False))
+    print(f"\nSaved (unranked, streamed): {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# cli/walkforward_sma.py
+import argparse
+from pathlib import Path
+import pandas as pd
+from data.store import load_ohlcv
+from strategy.sma_cross import SmaCross
+from backtest.walkforward import walk_forward, WFConfig
+from analytics.metrics import summary_stats
+from cli.sweep_sma import _ints, _floats
+
+def main():
+    ap = argparse.ArgumentParser(description="Walk-forward optimisation of the SMA-cross strategy")
+    ap.add_argument("--symbol", default="BTCUSDT")
+    ap.add_argument("--tf", default="15", help="Bybit interval string: 1,3,5,15,30,60,240,D")
+    ap.add_argument("--limit", type=int, default=2000)
+    ap.add_argument("--is-bars", type=int, default=1000, help="in-sample window (bars)")
+    ap.add_argument("--oos-bars", type=int, default=250, help="out-of-sample window (bars)")
+    ap.add_argument("--fast", type=_ints, default=[10, 20, 30])
+    ap.add_argument("--slow", type=_ints, default=[50, 100])
+    ap.add_argument("--slatr", type=_floats, default=[1.0, 1.5])
+    ap.add_argument("--tpatr", type=_floats, default=[2.0, 3.0])
+    ap.add_argument("--rank", default="final_equity")
+    args = ap.parse_args()
+
+    print(f"Loading {args.symbol} {args.tf}m candles (syncing local store)...")
+    df = load_ohlcv(args.symbol, interval=args.tf, limit=args.limit)
+
+    res = walk_forward(
+        df,
+        SmaCross,
+        strat_grid={"fast": args.fast, "slow": args.slow},
+        cfg_grid={"atr_mult_sl": args.slatr, "atr_mult_tp": args.tpatr},
+        wf=WFConfig(in_sample=args.is_bars, out_sample=args.oos_bars, rank_by=args.rank),
+    )
+    folds = res["folds"]
+    if folds.empty:
+        print("Not enough bars for a single fold.")
+        return
+
+    cols = ["fold", "oos_start", "fast", "slow", "atr_mult_sl", "atr_mult_tp",
+            f"is_{args.rank}", "oos_trades", "oos_final_equity", "oos_max_dd"]
+    print("\n=== Folds ===")
+    print(folds[cols].to_string(index=False))
+
+    print("\n=== Stitched out-of-sample ===")
+    for k, v in summary_stats(res["trades"], res["equity_curve"]).items():
+        print(f"{k}: {v}")
+
+    Path("reports").mkdir(exist_ok=True)
+    folds_path = Path(f"reports/{args.symbol}_{args.tf}m_wf_folds.csv")
+    eq_path = Path(f"reports/{args.symbol}_{args.tf}m_wf_equity.csv")
+    folds.to_csv(folds_path, index=False)
+    res["equity_curve"].to_csv(eq_path, header=["equity"])
+    print(f"\nSaved: {folds_path}")
+    print(f"Saved: {eq_path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # config/settings.py
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import os
 from dotenv import load_dotenv
@@ -15,9 +16,11 @@ class Settings:
     runtime_mode: str  # "backtest" | "paper" | "live"
     db_path: Path
 
-def load_env() -> Settings:
-    api_key = os.getenv("BYBIT_API_KEY", "").strip()
-    api_secret = os.getenv("BYBIT_API_SECRET", "").strip()
+def load_env(account: str = "") -> Settings:
+    # account "" -> BYBIT_API_KEY/SECRET; account "sub1" -> BYBIT_SUB1_API_KEY/SECRET
+    prefix = f"BYBIT_{account.upper()}_" if account else "BYBIT_"
+    api_key = os.getenv(prefix + "API_KEY", "").strip()
+    api_secret = os.getenv(prefix + "API_SECRET", "").strip()
     testnet = os.getenv("BYBIT_TESTNET", "true").lower() == "true"
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     runtime_mode = os.getenv("RUNTIME_MODE", "paper").lower()
@@ -25,9 +28,9 @@ def load_env() -> Settings:
 
     # Friendly checks with clear messages
     if not api_key or len(api_key) < 6:
-        raise ValueError("Missing or invalid BYBIT_API_KEY in .env")
+        raise ValueError(f"Missing or invalid {prefix}API_KEY in .env")
     if not api_secret or len(api_secret) < 10:
-        raise ValueError("Missing or invalid BYBIT_API_SECRET in .env")
+        raise ValueError(f"Missing or invalid {prefix}API_SECRET in .env")
     if runtime_mode not in {"backtest", "paper", "live"}:
         raise ValueError("RUNTIME_MODE must be backtest, paper, or live")
 
@@ -39,3 +42,8 @@ def load_env() -> Settings:
         runtime_mode=runtime_mode,
         db_path=db_path,
     )
+
+@lru_cache(maxsize=None)
+def get_settings(account: str = "") -> Settings:
+    """load_env() parsed once per process (per account); get_settings.cache_clear() re-reads."""
+    return load_env(account)
@@ -0,0 +1,183 @@
+# data/async_fetch.py
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import os
+import time
+
+import pandas as pd
+from pybit.unified_trading import HTTP
+
+from data.market_data import parse_klines, MAX_KLINES
+from exchange.ratelimit import TokenBucket
+from exchange.async_client import mount_pool
+from exchange.telemetry import TELEMETRY
+from core.logger import get_logger
+
+# Watchlist-scale market data: many symbols fetched concurrently over ONE pooled, keyless HTTP
+# session (public endpoints need no API keys, so no BybitClient / .env per call).
+# pybit is synchronous, so requests run on a thread pool driven from asyncio; a semaphore caps
+# in-flight requests and a TokenBucket keeps the total rate under the exchange's per-IP limit.
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_RATE = 50.0  # requests/s (Bybit allows 600 per 5 s per IP)
+
+def public_session(testnet: Optional[bool] = None, pool_size: int = DEFAULT_CONCURRENCY) -> HTTP:
+    """Keyless pybit HTTP session whose connection pool holds pool_size keep-alive connections."""
+    if testnet is None:
+        testnet = os.getenv("BYBIT_TESTNET", "true").lower() == "true"  # same switch as load_env()
+    session = HTTP(testnet=testnet, demo=True)  # same endpoint as BybitClient
+    mount_pool(session, pool_size)
+    TELEMETRY.attach(session)
+    return session
+
+class AsyncMarketData:
+    """
+    Concurrent klines/tickers for many symbols.
+
+        async with AsyncMarketData("linear") as md:
+            frames = await md.klines_many(await md.symbols(), "15", limit=200)
+
+    Failed symbols don't fail the batch: they are logged and kept in .errors ({symbol: exc}).
+    """
+    def __init__(self, category: str = "linear", concurrency: int = DEFAULT_CONCURRENCY,
+                 rate: float = DEFAULT_RATE, bucket: Optional[TokenBucket] = None,
+                 testnet: Optional[bool] = None, session: Optional[HTTP] = None):
+        self.category = category
+        self.concurrency = concurrency
+        self.bucket = bucket or TokenBucket(rate)
+        self.session = session or public_session(testnet, concurrency)
+        self.errors: Dict[str, Exception] = {}
+        self.stats = {"requests": 0, "wait_s": 0.0}
+        self.log = get_logger("AsyncMarketData")
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="md")
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncMarketData":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    async def _call(self, method: str, **params) -> dict:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)  # bound to the running loop
+        async with self._sem:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                self.stats["wait_s"] += wait
+                await asyncio.sleep(wait)
+            self.stats["requests"] += 1
+            fn = partial(TELEMETRY.call, method, getattr(self.session, method), **params)
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn)
+
+    # ---------- universe ----------
+    async def symbols(self, status: Optional[str] = "Trading", quote: Optional[str] = None) -> List[str]:
+        """All symbols of the category (cursor-paged), optionally filtered by status/quote coin."""
+        out, cursor = [], None
+        while True:
+            resp = await self._call("get_instruments_info", category=self.category, limit=1000, cursor=cursor)
+            res = resp.get("result", {}) or {}
+            for it in res.get("list", []) or []:
+                if status and it.get("status") != status:
+                    continue
+                if quote and it.get("quoteCoin") != quote:
+                    continue
+                out.append(it["symbol"])
+            cursor = res.get("nextPageCursor")
+            if not cursor:
+                return out
+
+    async def tickers(self, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """24h tickers for the whole category in one request (index = symbol, numeric columns)."""
+        resp = await self._call("get_tickers", category=self.category)
+        df = pd.DataFrame(resp.get("result", {}).get("list", []) or [])
+        if df.empty:
+            return df
+        df = df.set_index("symbol")
+        if symbols is not None:
+            df = df.reindex([s for s in symbols if s in df.index])
+        for c in df.columns:
+            num = pd.to_numeric(df[c], errors="coerce")
+            if num.notna().any():  # numeric field ("" -> NaN); all-text columns stay as they are
+                df[c] = num
+        return df
+
+    # ---------- klines ----------
+    async def klines(self, symbol: str, interval: str = "15", limit: int = 200,
+                     start: Optional[int] = None, end: Optional[int] = None,
+                     compact: bool = False) -> pd.DataFrame:
+        """
+        fetch_ohlcv() equivalent (oldest-first frame). limit > MAX_KLINES pages backwards from
+        `end` (pages of one symbol are sequential; symbols run concurrently).
+        """
+        frames, remaining = [], limit
+        while remaining > 0:
+            n = min(remaining, MAX_KLINES)
+            resp = await self._call("get_kline", category=self.category, symbol=symbol, interval=interval,
+                                    limit=n, start=start, end=end)
+            rows = resp.get("result", {}).get("list", []) or []
+            if not rows:
+                break
+            frames.append(parse_klines(rows, compact=compact))
+            remaining -= len(rows)
+            if len(rows) < n:
+                break
+            end = int(frames[-1].index[0].value // 1_000_000) - 1  # before the oldest bar so far
+            if start is not None and end < start:
+                break
+        if not frames:
+            raise RuntimeError(f"No klines returned for {symbol} {interval}")
+        df = pd.concat(frames[::-1]) if len(frames) > 1 else frames[0]
+        return df[~df.index.duplicated(keep="last")]
+
+    async def klines_many(self, symbols: Iterable[str], interval: str = "15", limit: int = 200,
+                          start: Optional[int] = None, end: Optional[int] = None,
+                          compact: bool = False) -> Dict[str, pd.DataFrame]:
+        """{symbol: frame} for every symbol that returned data (order of `symbols`)."""
+        symbols = list(symbols)
+
+        async def one(sym):
+            try:
+                return await self.klines(sym, interval, limit, start, end, compact)
+            except Exception as e:
+                self.errors[sym] = e
+                self.log.warning("klines %s %s failed: %s", sym, interval, e)
+                return None
+
+        frames = await asyncio.gather(*(one(s) for s in symbols))
+        return {s: f for s, f in zip(symbols, frames) if f is not None}
+
+def to_panel(frames: Dict[str, pd.DataFrame], field: Optional[str] = None) -> pd.DataFrame:
+    """
+    {symbol: OHLCV frame} -> one frame on the union of timestamps: columns (symbol, field),
+    or just symbols when `field` (e.g. "close") is given.
+    """
+    if not frames:
+        return pd.DataFrame()
+    if field is not None:
+        return pd.concat({s: f[field] for s, f in frames.items()}, axis=1)
+    return pd.concat(frames, axis=1, names=["symbol", "field"])
+
+def fetch_many(symbols: Optional[Iterable[str]] = None, interval: str = "15", limit: int = 200,
+               category: str = "linear", concurrency: int = DEFAULT_CONCURRENCY,
+               rate: float = DEFAULT_RATE, panel: bool = False, compact: bool = False):
+    """
+    Blocking helper: klines for `symbols` (None = every trading symbol of the category).
+    Returns {symbol: frame}, or the to_panel() frame when panel=True.
+    """
+    async def run():
+        async with AsyncMarketData(category, concurrency, rate) as md:
+            syms = list(symbols) if symbols is not None else await md.symbols()
+            t0 = time.perf_counter()
+            frames = await md.klines_many(syms, interval, limit, compact=compact)
+            md.log.info("Fetched %d/%d symbols (%s, %d bars) in %.1fs, %d requests",
+                        len(frames), len(syms), interval, limit, time.perf_counter() - t0, md.stats["requests"])
+            return frames
+    frames = asyncio.run(run())
+    return to_panel(frames) if panel else frames
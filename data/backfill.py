@@ -0,0 +1,168 @@
+# data/backfill.py
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.market_data import fetch_ohlcv, interval_ms, MAX_KLINES
+from data.store import CandleStore, STORE_ROOT, FIELDS, TimeLike, _ms
+from exchange.ratelimit import TokenBucket
+from exchange.bybit_client import BybitClient
+from exchange.registry import get_client
+
+DEFAULT_RATE = 50.0  # requests/s shared by all workers (Bybit allows 600 per 5 s per IP)
+
+def windows(start_ms: int, end_ms: int, interval: str) -> List[Tuple[int, int]]:
+    """
+    Split [start_ms, end_ms] into inclusive (a, b) windows of MAX_KLINES bars each.
+    Windows sit on a fixed grid (multiples of the window length since epoch), so the same
+    window gets the same key on every run and checkpoints survive a changed start date.
+    """
+    span = MAX_KLINES * interval_ms(interval)
+    a = start_ms - start_ms % span
+    out = []
+    while a <= end_ms:
+        out.append((a, a + span - 1))
+        a += span
+    return out
+
+def find_gaps(ts: np.ndarray, interval: str) -> List[Tuple[int, int, int]]:
+    """Holes in a sorted ms timestamp array -> [(last bar before, first bar after, missing bars)]."""
+    step = interval_ms(interval)
+    d = np.diff(ts)
+    idx = np.flatnonzero(d != step)
+    return [(int(ts[i]), int(ts[i + 1]), int(d[i] // step) - 1) for i in idx]
+
+class Backfill:
+    """
+    Concurrent historical download of one (category, symbol, interval) into its CandleStore.
+    - the range is split into fixed-grid MAX_KLINES windows, fetched by a thread pool, with
+      every request going through a shared TokenBucket (Bybit limits per IP)
+    - each finished window is staged as a .npy file next to the store; a manifest lists
+      windows already merged, so an interrupted run resumes with only the missing windows
+    - staged windows are merged into the store in one rewrite (overlaps deduplicated), then
+      the merged range is checked for continuity
+    Empty windows (before listing / exchange downtime) are checkpointed too; failed windows
+    (after retries) and the partial window holding `end` are not, so the next run retries
+    just those.
+    """
+    def __init__(self, symbol: str, interval: str = "1", category: str = "linear",
+                 root: Path = STORE_ROOT, bucket: Optional[TokenBucket] = None,
+                 client: Optional[BybitClient] = None, retries: int = 4):
+        self.store = CandleStore(symbol, interval, category, root)
+        self.symbol = symbol
+        self.interval = interval
+        self.category = category
+        self.bucket = bucket or TokenBucket(DEFAULT_RATE)
+        self.client = client
+        self.retries = retries
+        self.stage_dir = self.store.dir / "backfill"
+        self.manifest_path = self.store.dir / "backfill.json"
+
+    # ---------- checkpoint ----------
+    def _done(self) -> Set[int]:
+        done = set(json.loads(self.manifest_path.read_text())["done"]) if self.manifest_path.exists() else set()
+        if self.stage_dir.exists():
+            done.update(int(p.stem) for p in self.stage_dir.glob("*.npy"))
+        return done
+
+    def _save_manifest(self, done: Set[int]) -> None:
+        self.store.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"symbol": self.symbol, "interval": self.interval, "done": sorted(done)}))
+        os.replace(tmp, self.manifest_path)
+
+    def _stage(self, a: int, df: Optional[pd.DataFrame]) -> None:
+        # rows: ts, open, high, low, close, volume (ms timestamps are exact in float64)
+        if df is None or df.empty:
+            block = np.empty((6, 0))
+        else:
+            block = np.vstack([df.index.as_unit("ms").asi8.astype(float)] + [df[c].to_numpy(dtype=float) for c in FIELDS])
+        tmp = self.stage_dir / f"{a}.tmp.npy"
+        np.save(tmp, block)
+        os.replace(tmp, self.stage_dir / f"{a}.npy")
+
+    def _staged_frames(self) -> List[pd.DataFrame]:
+        frames = []
+        for p in sorted(self.stage_dir.glob("*.npy")):
+            block = np.load(p)
+            if block.shape[1]:
+                index = pd.DatetimeIndex(block[0].astype("i8").astype("M8[ms]"), name="datetime").tz_localize("UTC")
+                frames.append(pd.DataFrame(dict(zip(FIELDS, block[1:])), index=index))
+        return frames
+
+    # ---------- download ----------
+    def _fetch(self, a: int, b: int) -> Optional[pd.DataFrame]:
+        for attempt in range(self.retries):
+            self.bucket.acquire()
+            try:
+                return fetch_ohlcv(self.symbol, self.interval, MAX_KLINES, self.category,
+                                   start=a, end=b, client=self.client)
+            except RuntimeError:
+                return None  # no klines in this window
+            except Exception:
+                if attempt == self.retries - 1:
+                    raise
+                time.sleep(0.5 * 2 ** attempt)
+
+    def run(self, start: TimeLike, end: TimeLike = None, workers: int = 8,
+            executor: Optional[ThreadPoolExecutor] = None,
+            on_window: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Download [start, end] (end defaults to now). on_window(done, total) is called after
+        each window. Returns a report with window counts, rows added and the gaps found.
+        """
+        t0 = time.perf_counter()
+        start_ms = _ms(start)
+        end_ms = _ms(end) if end is not None else int(time.time() * 1000)
+        grid = windows(start_ms, end_ms, self.interval)
+        done = self._done()
+        todo = [(a, b) for a, b in grid if a not in done]
+        self.stage_dir.mkdir(parents=True, exist_ok=True)
+        if self.client is None:
+            self.client = get_client(category=self.category)  # one HTTP session for all windows
+
+        report = {"symbol": self.symbol, "interval": self.interval, "windows": len(grid),
+                  "resumed": len(grid) - len(todo), "fetched": 0, "empty": 0, "failed": 0}
+        pool = executor or ThreadPoolExecutor(max_workers=workers)
+        try:
+            futs = {pool.submit(self._fetch, a, b): a for a, b in todo}
+            for k, fut in enumerate(as_completed(futs), 1):
+                a = futs[fut]
+                try:
+                    df = fut.result()
+                except Exception:
+                    report["failed"] += 1
+                else:
+                    self._stage(a, df)
+                    report["fetched" if df is not None else "empty"] += 1
+                if on_window:
+                    on_window(k, len(todo))
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True, cancel_futures=True)  # Ctrl+C: drop queued windows, keep staged ones
+
+        # merge staged windows in one rewrite, then mark them done
+        staged = {int(p.stem) for p in self.stage_dir.glob("*.npy")}
+        report["rows_added"] = self.store.merge(self._staged_frames()) if staged else 0
+        if report["failed"]:
+            # the window holding end_ms is only partly downloaded (or still forming): keep it
+            # out of the manifest so a resumed run fetches it again
+            partial = {a for a, b in grid if b > end_ms}
+            self._save_manifest((done | staged) - partial)
+        elif self.manifest_path.exists():
+            self.manifest_path.unlink()  # range complete: nothing to resume
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
+
+        ts = self.store.read(start_ms, end_ms).index.as_unit("ms").asi8
+        report["bars"] = len(ts)
+        report["gaps"] = find_gaps(ts, self.interval)
+        report["seconds"] = time.perf_counter() - t0
+        return report
@@ -0,0 +1,265 @@
+# data/feed.py
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterator, Optional, Union
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from data.market_data import fetch_ohlcv, interval_ms, MAX_KLINES
+from data.store import CandleStore, STORE_ROOT, load_ohlcv
+from core.logger import get_logger
+
+# Market-data feeds: push confirmed (closed) bars to the runners as they happen instead of
+# the runners polling REST for a new candle every few seconds.
+
+@dataclass(frozen=True)
+class BarEvent:
+    symbol: str
+    interval: str
+    ts: pd.Timestamp          # bar start (UTC)
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    confirmed: bool = True    # False = update of the still-forming bar
+    source: str = "ws"        # "ws" | "rest" (gap-fill) | "replay"
+
+def events_from_frame(df: pd.DataFrame, symbol: str, interval: str, source: str) -> Iterator[BarEvent]:
+    for bar in df.itertuples():
+        yield BarEvent(symbol, interval, bar.Index, float(bar.open), float(bar.high), float(bar.low),
+                       float(bar.close), float(bar.volume), True, source)
+
+def append_bar(history: pd.DataFrame, ev: BarEvent, keep: int) -> pd.DataFrame:
+    """Closed-bar history + this event's bar (replacing a bar with the same ts), last `keep` rows."""
+    row = pd.DataFrame({"open": [ev.open], "high": [ev.high], "low": [ev.low], "close": [ev.close],
+                        "volume": [ev.volume]}, index=pd.DatetimeIndex([ev.ts], name="datetime"))
+    if len(history) and history.index[-1] >= ev.ts:
+        history = history[history.index < ev.ts]
+    out = pd.concat([history, row]) if len(history) else row
+    return out.iloc[-keep:]
+
+def with_forming_bar(history: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    history (closed bars) + a placeholder for the bar that just opened, so runners can keep
+    the "last row = forming bar, df.iloc[:-1] = closed bars" shape of the polling loop.
+    Its OHLC is the last close (Bybit opens a bar at the previous close).
+    """
+    last = history.iloc[-1]
+    ts = history.index[-1] + pd.Timedelta(milliseconds=interval_ms(interval))
+    c = float(last["close"])
+    row = pd.DataFrame({"open": [c], "high": [c], "low": [c], "close": [c], "volume": [0.0]},
+                       index=pd.DatetimeIndex([ts], name="datetime"))
+    return pd.concat([history[["open", "high", "low", "close", "volume"]], row])
+
+class Feed:
+    """
+    Bar feed interface used by the runners:
+      history(limit)  closed bars before the first event (warmup)
+      start()/stop()
+      iterate         yields BarEvents as they happen (blocking); ends when stopped/exhausted
+    """
+    symbol: str
+    interval: str
+
+    def history(self, limit: int) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[BarEvent]:
+        raise NotImplementedError
+
+class WsKlineFeed(Feed):
+    """
+    Bybit public kline WebSocket (pybit) -> confirmed BarEvents, typically within milliseconds
+    of the bar close.
+    - the socket thread only timestamps and queues messages; the consumer does the rest
+    - missing bars (reconnects, a slow start, dropped messages) are fetched over REST and
+      emitted in order before the next live bar, so no close is ever skipped
+    - a watchdog reconnects when no message arrived for `stale_after` seconds (pybit already
+      retries on socket errors; this also catches silently dead connections)
+    - confirmed bars are written to the CandleStore when one is given
+    """
+    def __init__(self, symbol: str, interval: str = "15", category: str = "linear",
+                 testnet: Optional[bool] = None, confirmed_only: bool = True,
+                 stale_after: float = 90.0, store: Optional[CandleStore] = None):
+        self.symbol = symbol
+        self.interval = interval
+        self.category = category
+        # same switch as config.settings.load_env(), without requiring API keys for public data
+        self.testnet = testnet if testnet is not None else os.getenv("BYBIT_TESTNET", "true").lower() == "true"
+        self.confirmed_only = confirmed_only
+        self.stale_after = stale_after
+        self.store = store
+        self.log = get_logger("WsKlineFeed")
+
+        self._q: "queue.Queue[dict]" = queue.Queue()
+        self._pending: Deque[BarEvent] = deque()
+        self._last_ts: Optional[pd.Timestamp] = None   # last confirmed bar emitted
+        self._last_msg = time.monotonic()
+        self._ws = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self.stats = {"ws": 0, "rest": 0, "reconnects": 0}
+
+    # ---------- warmup ----------
+    def history(self, limit: int) -> pd.DataFrame:
+        df = load_ohlcv(self.symbol, self.interval, limit + 1, self.category)
+        closed = df.iloc[:-1]  # last row is the forming bar
+        if len(closed):
+            self._last_ts = closed.index[-1]
+        return closed.iloc[-limit:]
+
+    # ---------- connection ----------
+    def _connect(self) -> None:
+        from pybit.unified_trading import WebSocket
+        ws = WebSocket(testnet=self.testnet, channel_type=self.category)
+        ws.kline_stream(interval=self.interval, symbol=self.symbol, callback=self._on_message)
+        self._ws = ws
+        self._last_msg = time.monotonic()
+
+    def _on_message(self, msg: dict) -> None:
+        # socket thread: liveness is stamped here, so a slow consumer can't look like a dead socket
+        self._last_msg = time.monotonic()
+        self._q.put(msg)
+
+    def _disconnect(self) -> None:
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.exit()
+            except Exception as e:
+                self.log.warning("WebSocket exit error: %s", e)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(1.0):
+            if time.monotonic() - self._last_msg < self.stale_after:
+                continue
+            self.log.warning("No kline message for %.0fs, reconnecting", self.stale_after)
+            self._disconnect()
+            try:
+                self._connect()
+                self.stats["reconnects"] += 1
+            except Exception as e:
+                self.log.error("Reconnect failed (retrying): %s", e)
+                self._last_msg = time.monotonic()  # back off one stale period
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._connect()
+        self._watchdog = threading.Thread(target=self._watch, name="kline-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._disconnect()
+
+    # ---------- events ----------
+    def _gap_fill(self, upto: pd.Timestamp) -> None:
+        """Queue REST bars strictly between the last emitted bar and `upto`."""
+        step = interval_ms(self.interval)
+        a = int(self._last_ts.value // 1_000_000) + step
+        b = int(upto.value // 1_000_000) - 1
+        while a <= b:
+            end = min(b, a + MAX_KLINES * step - 1)
+            try:
+                df = fetch_ohlcv(self.symbol, self.interval, MAX_KLINES, self.category, start=a, end=end)
+            except RuntimeError:
+                df = None  # no bars in this window (e.g. exchange downtime)
+            if df is not None:
+                for ev in events_from_frame(df, self.symbol, self.interval, "rest"):
+                    self._pending.append(ev)
+                    self.stats["rest"] += 1
+            a = end + 1
+
+    def _handle(self, msg: dict) -> None:
+        for k in msg.get("data", []) or []:
+            ts = pd.Timestamp(int(k["start"]), unit="ms", tz="UTC")
+            confirmed = bool(k.get("confirm"))
+            if not confirmed and self.confirmed_only:
+                continue
+            if confirmed:
+                if self._last_ts is not None and ts <= self._last_ts:
+                    continue  # already emitted (duplicate push / covered by gap-fill)
+                if self._last_ts is not None and ts > self._last_ts + pd.Timedelta(milliseconds=interval_ms(self.interval)):
+                    self._gap_fill(ts)
+                self._last_ts = ts
+                self.stats["ws"] += 1
+            self._pending.append(BarEvent(self.symbol, self.interval, ts, float(k["open"]), float(k["high"]),
+                                          float(k["low"]), float(k["close"]), float(k["volume"]),
+                                          confirmed, "ws"))
+
+    def next(self, timeout: Optional[float] = None) -> Optional[BarEvent]:
+        """Next event, or None if nothing arrived within timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._pending:
+            if self._stop.is_set():
+                return None
+            wait = 1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic()))
+            try:
+                self._handle(self._q.get(timeout=wait))
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+        ev = self._pending.popleft()
+        if ev.confirmed and self.store is not None:
+            self.store.write(pd.DataFrame({"open": [ev.open], "high": [ev.high], "low": [ev.low],
+                                           "close": [ev.close], "volume": [ev.volume]},
+                                          index=pd.DatetimeIndex([ev.ts], name="datetime")))
+        return ev
+
+    def __iter__(self) -> Iterator[BarEvent]:
+        while not self._stop.is_set():
+            ev = self.next()
+            if ev is not None:
+                yield ev
+
+class ReplayFeed(Feed):
+    """
+    Offline stand-in for WsKlineFeed: replays candles from a DataFrame or a CSV file (index =
+    bar start, columns open/high/low/close/volume) as confirmed BarEvents. The first `warmup`
+    rows are served by history(). speed=None replays as fast as possible; speed=60 plays one
+    bar interval per 1/60 of its real duration.
+    """
+    def __init__(self, data: Union[pd.DataFrame, str, Path], symbol: str = "REPLAY", interval: str = "15",
+                 warmup: int = 300, speed: Optional[float] = None):
+        if not isinstance(data, pd.DataFrame):
+            data = pd.read_csv(data, index_col=0)
+            data.index = pd.to_datetime(data.index, utc=True).rename("datetime")
+        self.df = data[["open", "high", "low", "close", "volume"]]
+        self.symbol = symbol
+        self.interval = interval
+        self.warmup = warmup
+        self.speed = speed
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_store(cls, symbol: str, interval: str = "15", category: str = "linear", start=None, end=None,
+                   root: Path = STORE_ROOT, **kwargs) -> "ReplayFeed":
+        return cls(CandleStore(symbol, interval, category, root).read(start, end), symbol, interval, **kwargs)
+
+    def history(self, limit: int) -> pd.DataFrame:
+        return self.df.iloc[max(0, self.warmup - limit): self.warmup]
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[BarEvent]:
+        pause = None if not self.speed else interval_ms(self.interval) / 1000 / self.speed
+        for ev in events_from_frame(self.df.iloc[self.warmup:], self.symbol, self.interval, "replay"):
+            if self._stop.is_set():
+                return
+            if pause:
+                time.sleep(pause)
+            yield ev
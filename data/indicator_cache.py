@@ -0,0 +1,102 @@
+# data/indicator_cache.py
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import inspect
+import threading
+
+import pandas as pd
+
+from data.market_data import add_sma, add_ema, add_rsi, add_atr
+
+# name -> batch function(df, **params) -> Series aligned to df.index
+INDICATORS: Dict[str, Callable[..., pd.Series]] = {
+    "sma": add_sma,
+    "ema": add_ema,
+    "rsi": add_rsi,
+    "atr": add_atr,
+}
+
+def frame_version(df: pd.DataFrame) -> Tuple:
+    """
+    O(1) identity of a candle frame's contents: length, first/last timestamp and the last bar's
+    OHLC. Slices/copies of the same candles share it; a new bar or an update of the forming bar
+    changes it. (Edits to bars in the middle of a frame are not detected.)
+    """
+    n = len(df)
+    if n == 0:
+        return (0,)
+    last = df.iloc[-1]
+    return (n, df.index[0], df.index[-1],
+            *(float(last[c]) for c in ("open", "high", "low", "close") if c in df.columns))
+
+class IndicatorCache:
+    """
+    Bounded LRU memo of indicator series keyed by (source, frame version, indicator, params).
+    Strategies and runners ask the cache instead of calling add_* directly, so N strategies on
+    the same candles compute each (indicator, params) once per bar. Memory is bounded by
+    max_entries and max_bytes (values only; the index is shared with the frame).
+    Cached Series are shared between callers: treat them as read-only.
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, pd.Series]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sigs: Dict[str, inspect.Signature] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _params(self, name: str, params: Dict[str, Any]) -> Tuple:
+        # normalize defaults so get(df, "atr") and get(df, "atr", period=14) share an entry
+        fn = INDICATORS[name]
+        sig = self._sigs.get(name) or self._sigs.setdefault(name, inspect.signature(fn))
+        bound = sig.bind_partial(None, **params)
+        bound.apply_defaults()
+        return tuple((k, v) for k, v in list(bound.arguments.items())[1:])
+
+    def get(self, df: pd.DataFrame, name: str, source: Optional[Hashable] = None, **params) -> pd.Series:
+        """
+        Indicator `name` (see INDICATORS) over df, computed at most once per frame version.
+        source: optional extra key (e.g. the symbol) for frames that could share a version.
+        """
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator {name!r}; have {sorted(INDICATORS)}")
+        key = (source, frame_version(df), name, self._params(name, params))
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                return hit
+            self.stats["misses"] += 1
+
+        series = INDICATORS[name](df, **params)  # computed outside the lock
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = series
+                self._bytes += series.to_numpy().nbytes
+                self._evict()
+        return series
+
+    def _evict(self) -> None:
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            _, old = self._data.popitem(last=False)
+            self._bytes -= old.to_numpy().nbytes
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+# process-wide cache used by strategies/runners unless one is passed explicitly
+DEFAULT_CACHE = IndicatorCache()
+
+def indicator(df: pd.DataFrame, name: str, cache: Optional[IndicatorCache] = None,
+              source: Optional[Hashable] = None, **params) -> pd.Series:
+    """Shorthand for (cache or DEFAULT_CACHE).get(df, name, source, **params)."""
+    return (cache if cache is not None else DEFAULT_CACHE).get(df, name, source, **params)
@@ -2,9 +2,11 @@
 from __future__ import annotations
 from typing import List, Dict
 import math
+import numpy as np
 import pandas as pd
 
 from exchange.bybit_client import BybitClient
+from exchange.registry import get_client
 
 # ---------- Helpers to parse Bybit kline ----------
 # Bybit v5 returns klines as list of strings like:
@@ -14,6 +16,7 @@ from exchange.bybit_client import BybitClient
 # We only use the first 6 fields.
 
 COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+MAX_KLINES = 1000  # Bybit per-request cap
 
 def _to_float(x):
     try:
@@ -31,34 +34,59 @@ def normalize_kline_row(row: List[str]) -> Dict:
         "volume": _to_float(row[5]),
     }
 
+# Bybit interval string -> bar length in ms ("M" is calendar-based, so not here)
+_INTERVAL_MS = {"D": 86_400_000, "W": 7 * 86_400_000}
+
+def interval_ms(interval: str) -> int:
+    if interval in _INTERVAL_MS:
+        return _INTERVAL_MS[interval]
+    try:
+        return int(interval) * 60_000
+    except ValueError:
+        raise ValueError(f"Unsupported interval {interval!r}") from None
+
+def parse_klines(rows: List[List[str]], compact: bool = False) -> pd.DataFrame:
+    """
+    Bulk version of normalize_kline_row(): Bybit's newest-first string rows -> oldest-first
+    DataFrame (UTC DatetimeIndex, open/high/low/close/volume) in one NumPy conversion.
+    compact=True stores the price/volume columns as float32 (half the memory; ~7 significant
+    digits, fine for research panels, not for order prices).
+    Rows with an unparsable or missing field are dropped, like the per-row path did.
+    """
+    try:
+        arr = np.array(rows, dtype=np.float64)[::-1]  # ts (ms) is exact in float64
+    except ValueError:
+        arr = None
+    if arr is None or arr.ndim != 2 or arr.shape[1] < 6:
+        # ragged/short rows or a bad field: per-value fallback, bad or missing values -> NaN -> dropped below
+        arr = np.array([[_to_float(x) for x in r[:6]] + [math.nan] * (6 - len(r[:6])) for r in rows],
+                       dtype=np.float64).reshape(-1, 6)[::-1]
+    vals = arr[:, 1:6]
+    keep = ~(np.isnan(arr[:, 0]) | np.isnan(vals).any(axis=1))
+    if not keep.any():
+        raise RuntimeError(f"No valid kline rows in {len(rows)} returned")
+    dtype = np.float32 if compact else np.float64
+    index = pd.DatetimeIndex(arr[keep, 0].astype(np.int64).astype("M8[ms]"), name="datetime").tz_localize("UTC")
+    return pd.DataFrame({c: vals[keep, i].astype(dtype) for i, c in enumerate(COLUMNS[1:])}, index=index)
+
 # ---------- Fetch & shape ----------
-def fetch_ohlcv(symbol: str, interval: str = "15", limit: int = 500, category: str = "linear") -> pd.DataFrame:
+def fetch_ohlcv(symbol: str, interval: str = "15", limit: int = 500, category: str = "linear",
+                start: int | None = None, end: int | None = None, client: BybitClient | None = None,
+                compact: bool = False) -> pd.DataFrame:
     """
     Returns a DataFrame with index=datetime (UTC), columns: open, high, low, close, volume
+    start/end: optional ms timestamps (inclusive) to fetch a past window instead of the latest bars
+    client: a specific BybitClient; default is the shared one for the category (exchange/registry)
+    compact: float32 columns (see parse_klines)
     """
-    client = BybitClient()
-    resp = client.get_klines(symbol, interval=interval, limit=limit, category=category)
+    client = client or get_client(category=category)
+    resp = client.get_klines(symbol, interval=interval, limit=limit, category=category, start=start, end=end)
     rows = resp.get("result", {}).get("list", []) or []
 
     if not rows:
         raise RuntimeError(f"No klines returned for {symbol} {interval}")
 
-    # Bybit returns newest-first; sort to oldest-first
-    rows = list(reversed(rows))
-
-    norm = [normalize_kline_row(r) for r in rows]
-    df = pd.DataFrame(norm, columns=COLUMNS)
-
-    # Set datetime index
-    df["datetime"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
-    df = df.set_index("datetime")[["open", "high", "low", "close", "volume"]]
-
-    # Ensure numeric
-    df = df.apply(pd.to_numeric, errors="coerce")
-
-    # Drop rows with NaNs at the end if any
-    df = df.dropna().copy()
-    return df
+    return parse_klines(rows, compact=compact)
 
 # ---------- Indicators ----------
 def add_sma(df: pd.DataFrame, period: int, col: str = "close") -> pd.Series:
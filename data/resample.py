@@ -0,0 +1,140 @@
+# data/resample.py
+from __future__ import annotations
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data.market_data import interval_ms
+from data.store import STORE_ROOT, load_ohlcv
+
+# Higher timeframes derived from 1m candles, bucketed the way Bybit labels them:
+# bars start on multiples of the interval since the epoch (UTC midnight for "D"),
+# weekly bars on Monday 00:00 UTC, monthly bars on the 1st.
+
+_WEEK_OFFSET = 4 * 86_400_000  # 1970-01-05 was the first Monday after the epoch
+
+# one higher-timeframe bar; same fields as a df.itertuples() row, so strategy.on_bar() takes it
+Bar = namedtuple("Bar", "Index open high low close volume")
+
+def bucket_start(ts_ms: np.ndarray, interval: str) -> np.ndarray:
+    """Start (ms) of the `interval` bar containing each timestamp."""
+    ts_ms = np.asarray(ts_ms, dtype=np.int64)
+    if interval == "M":
+        return ts_ms.astype("M8[ms]").astype("M8[M]").astype("M8[ms]").astype(np.int64)
+    step = interval_ms(interval)
+    offset = _WEEK_OFFSET if interval == "W" else 0
+    return (ts_ms - offset) // step * step + offset
+
+def bucket_end(start_ms: int, interval: str) -> int:
+    """Start (ms) of the bar following the one starting at start_ms."""
+    if interval == "M":
+        return int((np.int64(start_ms).astype("M8[ms]").astype("M8[M]") + 1).astype("M8[ms]").astype(np.int64))
+    return start_ms + interval_ms(interval)
+
+def resample_ohlcv(df: pd.DataFrame, interval: str, base_interval: str = "1",
+                   closed_only: bool = False) -> pd.DataFrame:
+    """
+    Aggregate a sorted fetch_ohlcv()-shaped frame (e.g. 1m bars) into `interval` bars in one
+    vectorized pass: open = first, high = max, low = min, close = last, volume = sum (reduceat
+    over the bucket boundaries). The first/last buckets may be partial; closed_only drops the
+    last one unless its final base bar is in.
+    """
+    if df.empty:
+        return df[["open", "high", "low", "close", "volume"]].copy()
+    ts = df.index.as_unit("ms").asi8
+    b = bucket_start(ts, interval)
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+
+    out = pd.DataFrame({
+        "open": df["open"].to_numpy(dtype=float)[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(dtype=float), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(dtype=float), starts),
+        "close": df["close"].to_numpy(dtype=float)[ends],
+        "volume": np.add.reduceat(df["volume"].to_numpy(dtype=float), starts),
+    }, index=pd.DatetimeIndex(b[starts].astype("M8[ms]"), name="datetime").tz_localize("UTC"))
+
+    if closed_only and ts[-1] + interval_ms(base_interval) < bucket_end(int(b[-1]), interval):
+        out = out.iloc[:-1]
+    return out
+
+def load_resampled(symbol: str, interval: str = "15", limit: int = 500, category: str = "linear",
+                   base_interval: str = "1", sync: bool = True, root: Path = STORE_ROOT) -> pd.DataFrame:
+    """
+    Newest `limit` bars of `interval`, derived from the symbol's stored base (1m) candles, so every
+    timeframe shares one download/storage stream. Syncs enough base bars to cover `limit` bars.
+    """
+    span = 31 * 86_400_000 if interval == "M" else interval_ms(interval)
+    per_bar = -(-span // interval_ms(base_interval))  # base bars per bar, rounded up
+    base = load_ohlcv(symbol, base_interval, (limit + 1) * per_bar, category, sync=sync, root=root)
+    return resample_ohlcv(base, interval, base_interval).iloc[-limit:]
+
+class Resampler:
+    """
+    Incremental version of resample_ohlcv(): feed base bars one at a time (oldest->newest) and
+    the open `interval` bar is updated in place (.current). update() returns the previous bar
+    once a base bar of the next bucket arrives.
+    Re-sending the latest base bar (same timestamp, e.g. the forming 1m candle being refreshed)
+    replaces its contribution instead of adding it twice.
+    """
+    def __init__(self, interval: str, base_interval: str = "1"):
+        self.interval = interval
+        self.base_interval = base_interval
+        self.current: Optional[Bar] = None
+        self._start: Optional[int] = None   # current bucket start (ms)
+        self._end: Optional[int] = None
+        self._agg: Optional[List[float]] = None    # o, h, l, c, v over the bucket's earlier base bars
+        self._last: Optional[List[float]] = None   # ts, o, h, l, c, v of the latest base bar
+
+    def update(self, ts_ms: int, open: float, high: float, low: float, close: float,
+               volume: float) -> Optional[Bar]:
+        closed = None
+        row = [ts_ms, open, high, low, close, volume]
+        if self._last is not None and ts_ms == self._last[0]:
+            self._last = row  # revision of the latest base bar
+        elif self._start is None or ts_ms >= self._end:
+            closed = self.current
+            self._start = int(bucket_start(np.int64(ts_ms), self.interval))
+            self._end = bucket_end(self._start, self.interval)
+            self._agg = None
+            self._last = row
+        else:
+            if ts_ms < self._last[0]:
+                raise ValueError(f"Out-of-order base bar {ts_ms} < {self._last[0]}")
+            self._agg = self._merge(self._agg, self._last[1:])
+            self._last = row
+
+        o, h, l, c, v = self._merge(self._agg, self._last[1:])
+        self.current = Bar(pd.Timestamp(self._start, unit="ms", tz="UTC"), o, h, l, c, v)
+        return closed
+
+    def on_bar(self, bar) -> Optional[Bar]:
+        """update() from a df.itertuples() row (or a Bar) of the base timeframe."""
+        return self.update(int(bar.Index.value // 1_000_000), float(bar.open), float(bar.high),
+                           float(bar.low), float(bar.close), float(bar.volume))
+
+    @staticmethod
+    def _merge(agg: Optional[List[float]], bar: List[float]) -> List[float]:
+        if agg is None:
+            return list(bar)
+        return [agg[0], max(agg[1], bar[1]), min(agg[2], bar[2]), bar[3], agg[4] + bar[4]]
+
+class MultiResampler:
+    """One base stream fanned out to several timeframes: {interval: Resampler}."""
+    def __init__(self, intervals: Sequence[str], base_interval: str = "1"):
+        self.resamplers: Dict[str, Resampler] = {iv: Resampler(iv, base_interval) for iv in intervals}
+
+    def on_bar(self, bar) -> Dict[str, Bar]:
+        """Feed one base bar; returns {interval: closed bar} for the timeframes that rolled over."""
+        out = {}
+        for iv, r in self.resamplers.items():
+            closed = r.on_bar(bar)
+            if closed is not None:
+                out[iv] = closed
+        return out
+
+    def current(self, interval: str) -> Optional[Bar]:
+        return self.resamplers[interval].current
@@ -0,0 +1,221 @@
+# data/store.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.market_data import fetch_ohlcv, interval_ms, MAX_KLINES
+
+STORE_ROOT = Path("storage/candles")
+FIELDS = ("open", "high", "low", "close", "volume")
+
+TimeLike = Union[int, str, pd.Timestamp, None]
+
+def _ms(t: TimeLike) -> Optional[int]:
+    """ms epoch from an int (already ms), ISO string or Timestamp (naive = UTC)."""
+    if t is None:
+        return None
+    if isinstance(t, (int, np.integer)):
+        return int(t)
+    t = pd.Timestamp(t)
+    if t.tz is None:
+        t = t.tz_localize("UTC")
+    return int(t.value // 1_000_000)
+
+class CandleStore:
+    """
+    On-disk OHLCV for one (category, symbol, interval), stored column-wise as raw little-endian
+    files (ts.i8 = bar start in ms, open.f8 ... volume.f8) plus meta.json with the row count.
+    Reads go through np.memmap, so a time-range read only touches the pages it needs and never
+    hits the API; sync() fetches just the bars after the last stored one.
+    - rows are sorted by ts and unique
+    - the last stored bar is re-fetched on every sync, since it may still have been forming
+    - meta.json is rewritten (atomically) after the column data, so a crash mid-append leaves
+      the previous row count valid
+    Single writer per store; concurrent readers are fine.
+    """
+    def __init__(self, symbol: str, interval: str = "15", category: str = "linear", root: Path = STORE_ROOT):
+        self.symbol = symbol
+        self.interval = interval
+        self.category = category
+        self.dir = Path(root) / category / symbol / interval
+        self.rows = 0
+        self._load_meta()
+
+    # ---------- layout ----------
+    def _path(self, col: str) -> Path:
+        return self.dir / (f"{col}.i8" if col == "ts" else f"{col}.f8")
+
+    def _dtype(self, col: str) -> str:
+        return "<i8" if col == "ts" else "<f8"
+
+    def _load_meta(self) -> None:
+        meta = self.dir / "meta.json"
+        self.rows = json.loads(meta.read_text())["rows"] if meta.exists() else 0
+
+    def _save_meta(self, rows: int) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.dir / "meta.json.tmp"
+        tmp.write_text(json.dumps({"symbol": self.symbol, "interval": self.interval,
+                                   "category": self.category, "rows": rows}))
+        os.replace(tmp, self.dir / "meta.json")
+        self.rows = rows
+
+    def _column(self, col: str) -> np.ndarray:
+        """Read-only memmap of a column (first self.rows entries)."""
+        if self.rows == 0:
+            return np.empty(0, dtype=self._dtype(col))
+        return np.memmap(self._path(col), dtype=self._dtype(col), mode="r", shape=(self.rows,))
+
+    # ---------- queries ----------
+    def __len__(self) -> int:
+        self._load_meta()
+        return self.rows
+
+    def first_ts(self) -> Optional[int]:
+        self._load_meta()
+        return int(self._column("ts")[0]) if self.rows else None
+
+    def last_ts(self) -> Optional[int]:
+        self._load_meta()
+        return int(self._column("ts")[-1]) if self.rows else None
+
+    def read(self, start: TimeLike = None, end: TimeLike = None, limit: Optional[int] = None,
+             compact: bool = False) -> pd.DataFrame:
+        """
+        Bars with start <= bar start <= end (both optional), newest `limit` of them if given.
+        Same shape as fetch_ohlcv(): UTC DatetimeIndex named "datetime", float64 OHLCV columns
+        (float32 with compact=True, e.g. for multi-year research panels).
+        The returned frame owns its data (copied out of the memmaps).
+        """
+        self._load_meta()
+        ts = self._column("ts")
+        a = 0 if start is None else int(np.searchsorted(ts, _ms(start), side="left"))
+        b = len(ts) if end is None else int(np.searchsorted(ts, _ms(end), side="right"))
+        if limit is not None:
+            a = max(a, b - limit)
+        index = pd.DatetimeIndex(np.array(ts[a:b]).astype("M8[ms]"), name="datetime").tz_localize("UTC")
+        dtype = np.float32 if compact else np.float64
+        return pd.DataFrame({c: np.array(self._column(c)[a:b], dtype=dtype) for c in FIELDS}, index=index)
+
+    # ---------- writes ----------
+    def write(self, df: pd.DataFrame) -> int:
+        """
+        Insert bars from a fetch_ohlcv()-shaped frame; bars already stored are overwritten.
+        Returns the number of new rows. Appending at the tail (the usual sync case) writes only
+        the new rows in place; anything older than the last stored bar rewrites the columns.
+        """
+        if df.empty:
+            return 0
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        ts = df.index.as_unit("ms").asi8
+        cols = {"ts": ts, **{c: df[c].to_numpy(dtype=float) for c in FIELDS}}
+
+        self._load_meta()
+        before = self.rows
+        last = int(self._column("ts")[-1]) if self.rows else None
+        if last is None or ts[0] >= last:
+            at = self.rows - 1 if last is not None and ts[0] == last else self.rows
+            self._write_at(at, cols)
+            self._save_meta(at + len(ts))
+            return self.rows - before
+        return self.merge([df])
+
+    def merge(self, frames: Sequence[pd.DataFrame]) -> int:
+        """
+        Merge any number of frames (any order, overlapping or not) into the store with a single
+        column rewrite; newer frames win on duplicate timestamps. Returns the number of new rows.
+        """
+        self._load_meta()
+        before = self.rows
+        parts = [self.read()] + [f[list(FIELDS)] for f in frames if len(f)]
+        merged = pd.concat(parts)
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        ts = merged.index.as_unit("ms").asi8
+        self._rewrite({"ts": ts, **{c: merged[c].to_numpy(dtype=float) for c in FIELDS}})
+        self._save_meta(len(ts))
+        return self.rows - before
+
+    def _write_at(self, row: int, cols: Dict[str, np.ndarray]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for col, arr in cols.items():
+            path = self._path(col)
+            with open(path, "r+b" if path.exists() else "w+b") as f:
+                f.seek(row * 8)
+                f.write(np.ascontiguousarray(arr, dtype=self._dtype(col)).tobytes())
+                f.truncate()
+
+    def _rewrite(self, cols: Dict[str, np.ndarray]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for col, arr in cols.items():
+            tmp = self._path(col).with_suffix(".tmp")
+            np.ascontiguousarray(arr, dtype=self._dtype(col)).tofile(tmp)
+            os.replace(tmp, self._path(col))
+
+    # ---------- sync ----------
+    def sync(self, min_bars: int = 0, since: TimeLike = None) -> int:
+        """
+        Bring the store up to date: fetch only bars after the last stored one (in MAX_KLINES
+        pages), then page backwards until at least `min_bars` bars / everything since `since`
+        is stored. An empty store is seeded with the latest max(min_bars, 1) bars.
+        Returns the number of new rows.
+        """
+        step = interval_ms(self.interval)
+        before = len(self)
+        now = int(time.time() * 1000)
+
+        last = self.last_ts()
+        if last is None:
+            self.write(fetch_ohlcv(self.symbol, self.interval, min(max(min_bars, 1), MAX_KLINES), self.category))
+        else:
+            start = last  # re-fetch the last stored bar: it may have been still forming
+            while start <= now:
+                end = start + MAX_KLINES * step - 1
+                limit = min(MAX_KLINES, (min(end, now) - start) // step + 1)
+                try:
+                    self.write(fetch_ohlcv(self.symbol, self.interval, limit, self.category, start=start, end=end))
+                except RuntimeError:
+                    break  # no klines in this window
+                start = end + 1
+
+        # older history, collected first and merged in one rewrite
+        since_ms = _ms(since)
+        pages: List[pd.DataFrame] = []
+        first = self.first_ts()
+        have = len(self)
+        while first is not None and (have < min_bars or (since_ms is not None and first > since_ms)):
+            end = first - 1
+            want = max(min_bars - have, 0 if since_ms is None else -(-(first - since_ms) // step))
+            limit = min(MAX_KLINES, max(want, 1))
+            try:
+                page = fetch_ohlcv(self.symbol, self.interval, limit, self.category,
+                                   start=end - limit * step + 1, end=end)
+            except RuntimeError:
+                break  # before the symbol's listing
+            pages.append(page)
+            have += len(page)
+            first = _ms(page.index[0])
+        if pages:
+            self.merge(pages)
+        return len(self) - before
+
+def load_ohlcv(symbol: str, interval: str = "15", limit: int = 500, category: str = "linear",
+               start: TimeLike = None, end: TimeLike = None, sync: bool = True,
+               root: Path = STORE_ROOT, compact: bool = False) -> pd.DataFrame:
+    """
+    Drop-in for fetch_ohlcv() served from the local CandleStore: syncs the store (new bars only,
+    plus older history if fewer than `limit` bars / nothing before `start` is stored), then reads
+    the newest `limit` bars, or the [start, end] range if given. sync=False never touches the API.
+    compact=True returns float32 columns (half the memory).
+    """
+    store = CandleStore(symbol, interval, category, root)
+    if sync:
+        store.sync(min_bars=0 if start is not None else limit, since=start)
+    if start is not None or end is not None:
+        return store.read(start, end, compact=compact)
+    return store.read(limit=limit, compact=compact)
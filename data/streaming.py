@@ -0,0 +1,167 @@
+# data/streaming.py
+from __future__ import annotations
+from collections import deque
+from typing import Any, Dict
+import math
+
+# ---------- Incremental indicators (O(1) per appended bar) ----------
+# Same numbers as the batch functions in data/market_data.py, but updated one bar at a time
+# so live loops don't recompute the whole history on every poll.
+# Every indicator can snapshot() its state to a plain (JSON-safe) dict and be rebuilt with
+# Cls.restore(state), e.g. to persist a warmed-up strategy across restarts.
+
+class StreamIndicator:
+    _state = ()  # attribute names making up the state (besides the constructor args)
+
+    def snapshot(self) -> Dict[str, Any]:
+        out = {"type": type(self).__name__, "args": self._args()}
+        for name in self._state:
+            v = getattr(self, name)
+            if isinstance(v, StreamIndicator):
+                v = v.snapshot()
+            elif isinstance(v, deque):
+                v = list(v)
+            out[name] = v
+        return out
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> "StreamIndicator":
+        if state.get("type") != cls.__name__:
+            raise ValueError(f"Snapshot of {state.get('type')!r} can't restore a {cls.__name__}")
+        obj = cls(**state["args"])
+        for name in cls._state:
+            cur = getattr(obj, name)
+            v = state[name]
+            if isinstance(cur, StreamIndicator):
+                v = type(cur).restore(v)
+            elif isinstance(cur, deque):
+                v = deque(v, maxlen=cur.maxlen)
+            setattr(obj, name, v)
+        return obj
+
+    def _args(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class StreamEWM(StreamIndicator):
+    """
+    ewm(alpha=..., adjust=False, min_periods=...).mean(), one value at a time.
+    Written exactly like pandas' adjust=False recursion so values match bit-for-bit.
+    """
+    _state = ("_mean", "_nobs", "value")
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self._mean = math.nan
+        self._nobs = 0
+        self.value = math.nan
+
+    def _args(self) -> Dict[str, Any]:
+        return {"alpha": self.alpha, "min_periods": self.min_periods}
+
+    def update(self, x: float) -> float:
+        if not math.isnan(x):
+            self._nobs += 1
+            if math.isnan(self._mean):
+                self._mean = x  # seeded with the first observation
+            elif self._mean != x:
+                old_wt = 1 - self.alpha
+                self._mean = (old_wt * self._mean + self.alpha * x) / (old_wt + self.alpha)
+        self.value = self._mean if self._nobs >= max(self.min_periods, 1) else math.nan
+        return self.value
+
+
+class StreamSMA(StreamIndicator):
+    """Rolling mean over a ring buffer with a running sum (same as add_sma)."""
+    _state = ("_buf", "_sum", "_since_resync", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._buf: deque = deque(maxlen=period)
+        self._sum = 0.0
+        self._since_resync = 0
+        self.value = math.nan
+
+    def _args(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.period:
+            self._sum -= self._buf[0]
+        self._buf.append(x)
+        self._sum += x
+
+        # re-add the window once per full wrap: kills float drift, still amortized O(1)
+        self._since_resync += 1
+        if self._since_resync >= self.period:
+            self._sum = math.fsum(self._buf)
+            self._since_resync = 0
+
+        self.value = self._sum / self.period if len(self._buf) == self.period else math.nan
+        return self.value
+
+
+class StreamEMA(StreamIndicator):
+    """EMA with span=period, NaN until `period` bars (same as add_ema)."""
+    _state = ("_ewm", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._ewm = StreamEWM(2 / (period + 1), min_periods=period)
+        self.value = math.nan
+
+    def _args(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def update(self, x: float) -> float:
+        self.value = self._ewm.update(x)
+        return self.value
+
+
+class StreamRSI(StreamIndicator):
+    """Wilder RSI: recursive smoothing of gains/losses (same as add_rsi; NaN while losses are 0)."""
+    _state = ("_gain", "_loss", "_prev", "value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gain = StreamEWM(1 / period)
+        self._loss = StreamEWM(1 / period)
+        self._prev = math.nan
+        self.value = math.nan
+
+    def _args(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def update(self, x: float) -> float:
+        delta = x - self._prev  # NaN on the first bar, like diff()
+        self._prev = x
+        gain = self._gain.update(max(delta, 0.0) if not math.isnan(delta) else delta)
+        loss = self._loss.update(-min(delta, 0.0) if not math.isnan(delta) else delta)
+        if math.isnan(gain) or math.isnan(loss) or loss == 0:
+            self.value = math.nan
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+
+class StreamATR(StreamIndicator):
+    """Wilder ATR: recursive smoothing of True Range (same as add_atr)."""
+    _state = ("_ewm", "_prev_close", "value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._ewm = StreamEWM(1 / period)
+        self._prev_close = math.nan
+        self.value = math.nan
+
+    def _args(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = abs(high - low)
+        if not math.isnan(self._prev_close):
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._ewm.update(tr)
+        return self.value
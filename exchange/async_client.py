@@ -0,0 +1,124 @@
+# exchange/async_client.py
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import threading
+
+import requests
+
+from config.settings import get_settings
+from exchange.bybit_client import BybitClient
+from exchange.ratelimit import TokenBucket
+
+# asyncio facade over BybitClient: same methods, awaitable, with
+# - its own client whose keep-alive connection pool is sized for the fan-out (pybit's session is
+#   thread-safe), so the shared registry clients (live runner, ...) keep their pool
+# - a token bucket per endpoint group, shared by every client on the same API key in this
+#   process, so parallel calls stay under Bybit's limits instead of hitting 10006
+# pybit is synchronous, so calls run on a thread pool; the buckets are awaited, not slept on.
+
+# requests/s per group (Bybit v5 defaults: orders 10/s per UID on derivatives, most private
+# queries 50/s per UID, public market data 600 per 5 s per IP)
+DEFAULT_LIMITS: Dict[str, float] = {"market": 50.0, "order": 10.0, "query": 50.0, "account": 50.0}
+
+# BybitClient method -> endpoint group
+METHOD_GROUPS: Dict[str, str] = {
+    "ping": "market", "server_time": "market", "get_symbols": "market", "get_instruments_info": "market",
+    "get_ticker": "market",
+    "get_klines": "market", "get_symbol_info": "market", "get_min_qty": "market", "get_tick_size": "market",
+    "get_balance": "account",
+    "get_positions": "query", "get_fills": "query",
+    "place_order": "order", "amend_order": "order", "cancel_order": "order", "place_postonly_limit": "order",
+    "place_batch_order": "order", "cancel_batch_order": "order", "cancel_all_orders": "order",
+}
+
+DEFAULT_CONCURRENCY = 32
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def shared_bucket(key: str, group: str, limits: Optional[Dict[str, float]] = None) -> TokenBucket:
+    """Process-wide bucket for (API key, group); created with limits[group] on first use."""
+    with _buckets_lock:
+        b = _buckets.get((key, group))
+        if b is None:
+            b = _buckets[(key, group)] = TokenBucket((limits or DEFAULT_LIMITS)[group])
+        return b
+
+def mount_pool(session, size: int) -> None:
+    """
+    Give a pybit HTTP session a keep-alive pool of at least `size` connections (default is 10).
+    Replaces the session's https adapter, so it affects every user of the session; never shrinks it.
+    """
+    current = getattr(session.client.get_adapter("https://"), "_pool_maxsize", requests.adapters.DEFAULT_POOLSIZE)
+    if size > current:
+        session.client.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+class AsyncBybitClient:
+    """
+    Awaitable BybitClient:
+
+        client = AsyncBybitClient()
+        pos, kl = await asyncio.gather(client.get_positions("BTCUSDT"), client.get_klines("ETHUSDT"))
+
+    Every BybitClient method is available as a coroutine with the same arguments; the call is
+    rate-limited by its METHOD_GROUPS group ("market" for unknown methods).
+    Without `client` a dedicated BybitClient is created; a client passed in gets its
+    connection pool enlarged to `concurrency` (see mount_pool), which its other users share.
+    """
+    def __init__(self, client: Optional[BybitClient] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 limits: Optional[Dict[str, float]] = None):
+        self.sync = client or BybitClient(get_settings())
+        self.concurrency = concurrency
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.log = self.sync.log
+        mount_pool(self.sync.session, concurrency)
+        self.buckets = {g: shared_bucket(self.sync.cfg.api_key, g, self.limits) for g in self.limits}
+        self.stats = {"requests": 0, "wait_s": 0.0}
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bybit")
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncBybitClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    async def call(self, group: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool once the group's bucket allows it."""
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)  # bound to the running loop
+        # wait for the bucket before taking a slot: calls throttled in one group (orders) must
+        # not hold up the others
+        wait = self.buckets[group].reserve()
+        if wait > 0:
+            self.stats["wait_s"] += wait
+            await asyncio.sleep(wait)
+        async with self._sem:
+            self.stats["requests"] += 1
+            return await asyncio.get_running_loop().run_in_executor(self._pool, partial(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        # get_klines, place_order, ... -> coroutine functions over the sync client's methods
+        if name == "sync":
+            raise AttributeError(name)  # not initialized yet
+        fn = getattr(self.sync, name)
+        if name.startswith("_") or not callable(fn):
+            return fn
+        group = METHOD_GROUPS.get(name, "market")
+
+        async def method(*args, **kwargs):
+            return await self.call(group, fn, *args, **kwargs)
+        method.__name__ = name
+        return method
+
+    async def fan_out(self, name: str, calls: Iterable[Dict[str, Any]],
+                      return_exceptions: bool = True) -> List[Any]:
+        """Concurrent self.<name>(**kw) for every kw in calls; results in order (exceptions returned)."""
+        method = getattr(self, name)
+        return await asyncio.gather(*(method(**kw) for kw in calls), return_exceptions=return_exceptions)
@@ -1,27 +1,51 @@
 # exchange/bybit_client.py
 from pybit.unified_trading import HTTP
-from config.settings import load_env
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from config.settings import Settings, get_settings
 from core.logger import get_logger
+from exchange.telemetry import TELEMETRY, Telemetry
 
 
 class BybitClient:
-    def __init__(self):
-        self.cfg = load_env()
+    # settings: parsed once per process by default (see exchange/registry.get_client for shared clients)
+    def __init__(self, settings: Settings | None = None, telemetry: Telemetry | None = None):
+        self.cfg = settings or get_settings()
+        self.telemetry = telemetry or TELEMETRY  # per-endpoint latency / errors / rate-limit headroom
         self.log = get_logger("BybitClient", self.cfg.log_level)
 
         # Create a session
-        self.session = HTTP(
+        self.session = self._new_session()
+        self.log.info("Bybit client initialized (testnet=%s)", self.cfg.testnet)
+
+    def _new_session(self) -> HTTP:
+        session = HTTP(
             api_key=self.cfg.api_key,
             api_secret=self.cfg.api_secret,
             testnet=self.cfg.testnet,
             demo=True
         )
-        self.log.info("Bybit client initialized (testnet=%s)", self.cfg.testnet)
+        self.telemetry.attach(session)
+        return session
+
+    def _call(self, method: str, **params):
+        """self.session.<method>(**params), recorded in telemetry under the pybit method name."""
+        return self.telemetry.call(method, getattr(self.session, method), **params)
+
+    def reconnect(self):
+        """Replace the HTTP session (fresh connections), keeping a custom pool size if one was mounted."""
+        old = self.session
+        self.session = self._new_session()
+        adapter = old.client.get_adapter("https://")
+        size = getattr(adapter, "_pool_maxsize", None)
+        if size and size != DEFAULT_POOLSIZE:
+            self.session.client.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=size))
+        old.client.close()
+        self.log.warning("Bybit client reconnected (testnet=%s)", self.cfg.testnet)
 
     # --- Basic checks ---
     def ping(self) -> bool:
         try:
-            self.session.get_server_time()
+            self._call("get_server_time")
             return True
         except Exception as e:
             self.log.error("Ping failed: %s", e)
@@ -29,31 +53,38 @@ class BybitClient:
 
     def server_time(self):
         try:
-            return self.session.get_server_time()
+            return self._call("get_server_time")
         except Exception as e:
             self.log.error("Server time error: %s", e)
             return None
 
     # --- Market data ---
     def get_symbols(self, category="linear"):
-        return self.session.get_instruments_info(category=category)
+        return self._call("get_instruments_info", category=category)
+
+    def get_instruments_info(self, category="linear", limit=1000, cursor=None):
+        # one page of instrument specs; pass result.nextPageCursor back as cursor for the next page
+        return self._call("get_instruments_info", category=category, limit=limit, cursor=cursor)
 
     def get_ticker(self, symbol, category="linear"):
-        return self.session.get_tickers(category=category, symbol=symbol)
+        return self._call("get_tickers", category=category, symbol=symbol)
 
-    def get_klines(self, symbol, interval="15", limit=100, category="linear"):
-        return self.session.get_kline(category=category, symbol=symbol, interval=interval, limit=limit)
+    def get_klines(self, symbol, interval="15", limit=100, category="linear", start=None, end=None):
+        # start/end: optional ms timestamps to page through history (None = latest bars)
+        return self._call("get_kline", category=category, symbol=symbol, interval=interval, limit=limit,
+                          start=start, end=end)
 
     # --- Account info ---
     def get_balance(self, account_type="UNIFIED"):
-        return self.session.get_wallet_balance(accountType=account_type)
+        return self._call("get_wallet_balance", accountType=account_type)
 
     def get_positions(self, symbol=None, category="linear"):
-        return self.session.get_positions(category=category, symbol=symbol)
+        return self._call("get_positions", category=category, symbol=symbol)
 
     # --- Orders ---
     def place_order(self, symbol, side, qty, order_type="Market", price=None, category="linear", **kwargs):
-        return self.session.place_order(
+        return self._call(
+            "place_order",
             category=category,
             symbol=symbol,
             side=side,
@@ -63,15 +94,31 @@ class BybitClient:
             **kwargs
         )
 
+    def amend_order(self, symbol, order_id=None, category="linear", **kwargs):
+        # kwargs: price, qty, takeProfit, stopLoss, triggerPrice, orderLinkId, ... (only what changes)
+        return self._call("amend_order", category=category, symbol=symbol, orderId=order_id, **kwargs)
+
     def cancel_order(self, symbol, order_id=None, category="linear", **kwargs):
-        return self.session.cancel_order(category=category, symbol=symbol, orderId=order_id, **kwargs)
+        return self._call("cancel_order", category=category, symbol=symbol, orderId=order_id, **kwargs)
+
+    # Batch endpoints: `request` is a list of per-order dicts (string qty/price), at most
+    # 20 orders per call for linear/inverse/option and 10 for spot
+    def place_batch_order(self, request, category="linear"):
+        return self._call("place_batch_order", category=category, request=request)
+
+    def cancel_batch_order(self, request, category="linear"):
+        return self._call("cancel_batch_order", category=category, request=request)
+
+    def cancel_all_orders(self, symbol=None, category="linear", **kwargs):
+        # symbol=None: pass baseCoin= or settleCoin= to cancel across symbols
+        return self._call("cancel_all_orders", category=category, symbol=symbol, **kwargs)
 
     def get_fills(self, symbol=None, category="linear"):
-        return self.session.get_executions(category=category, symbol=symbol)
+        return self._call("get_executions", category=category, symbol=symbol)
     
     def get_symbol_info(self, symbol, category="linear"):
         try:
-            data = self.session.get_instruments_info(category=category, symbol=symbol)
+            data = self._call("get_instruments_info", category=category, symbol=symbol)
             items = data.get("result", {}).get("list", [])
             return items[0] if items else None
         except Exception as e:
@@ -0,0 +1,109 @@
+# exchange/instruments.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+import threading
+import time
+
+from exchange.bybit_client import BybitClient
+from exchange.registry import get_client
+from core.logger import get_logger
+
+def _f(x, default: float = 0.0) -> float:
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return default
+
+@dataclass(frozen=True)
+class InstrumentSpec:
+    symbol: str
+    category: str
+    tick_size: float
+    qty_step: float
+    min_qty: float
+    max_qty: float
+    min_notional: float
+    status: str
+
+    @classmethod
+    def from_info(cls, info: dict, category: str) -> "InstrumentSpec":
+        """One get_instruments_info() list item -> spec (spot has basePrecision instead of qtyStep)."""
+        lot = info.get("lotSizeFilter", {}) or {}
+        price = info.get("priceFilter", {}) or {}
+        return cls(
+            symbol=info["symbol"],
+            category=category,
+            tick_size=_f(price.get("tickSize")),
+            qty_step=_f(lot.get("qtyStep") or lot.get("basePrecision")),
+            min_qty=_f(lot.get("minOrderQty")),
+            max_qty=_f(lot.get("maxOrderQty") or lot.get("maxMktOrderQty"), float("inf")),
+            min_notional=_f(lot.get("minNotionalValue") or lot.get("minOrderAmt")),
+            status=info.get("status", ""),
+        )
+
+class InstrumentCatalog:
+    """
+    In-memory instrument specs (tick size, qty step, min qty, ...) for whole categories.
+    - load(category) pulls every instrument of the category in a few paged requests
+    - get() is a dict lookup; a category is (re)loaded on first use and after `ttl` seconds
+    - a symbol missing from a loaded category (e.g. listed since) triggers one single-symbol
+      request, not a full reload
+    If a refresh fails the previous specs stay in use.
+    """
+    def __init__(self, client: Optional[BybitClient] = None, ttl: float = 6 * 3600.0,
+                 categories: Iterable[str] = ()):
+        self.client = client or get_client()
+        self.ttl = ttl
+        self.log = get_logger("InstrumentCatalog")
+        self._specs: Dict[str, Dict[str, InstrumentSpec]] = {}   # category -> symbol -> spec
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        for cat in categories:
+            self.load(cat)
+
+    def load(self, category: str = "linear") -> int:
+        """Bulk (re)load one category; returns the number of instruments."""
+        specs, cursor = {}, None
+        try:
+            while True:
+                resp = self.client.get_instruments_info(category, limit=1000, cursor=cursor)
+                res = resp.get("result", {}) or {}
+                for it in res.get("list", []) or []:
+                    specs[it["symbol"]] = InstrumentSpec.from_info(it, category)
+                cursor = res.get("nextPageCursor")
+                if not cursor:
+                    break
+        except Exception as e:
+            self.log.error("Loading %s instruments failed: %s", category, e)
+            with self._lock:
+                self._loaded_at[category] = time.monotonic()  # don't retry on every lookup
+            return len(self._specs.get(category, {}))
+        with self._lock:
+            self._specs[category] = specs
+            self._loaded_at[category] = time.monotonic()
+        self.log.info("Loaded %d %s instruments", len(specs), category)
+        return len(specs)
+
+    def refresh(self, category: Optional[str] = None) -> None:
+        """Reload one category now, or every loaded one."""
+        for cat in ([category] if category else list(self._loaded_at)):
+            self.load(cat)
+
+    def get(self, symbol: str, category: str = "linear") -> Optional[InstrumentSpec]:
+        loaded = self._loaded_at.get(category)
+        if loaded is None or time.monotonic() - loaded > self.ttl:
+            self.load(category)
+        spec = self._specs.get(category, {}).get(symbol)
+        if spec is None:
+            spec = self._fetch_one(symbol, category)
+        return spec
+
+    def _fetch_one(self, symbol: str, category: str) -> Optional[InstrumentSpec]:
+        info = self.client.get_symbol_info(symbol, category)
+        if not info:
+            return None
+        spec = InstrumentSpec.from_info(info, category)
+        with self._lock:
+            self._specs.setdefault(category, {})[symbol] = spec
+        return spec
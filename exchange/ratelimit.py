@@ -0,0 +1,52 @@
+# exchange/ratelimit.py
+from __future__ import annotations
+from typing import Optional
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills `rate` tokens per second up to `capacity` (burst size).
+    reserve() books tokens immediately and returns how long the caller must wait before using
+    them, so callers queue fairly in arrival order and the same bucket can back asyncio code
+    (await asyncio.sleep(bucket.reserve())) as well as threads (bucket.acquire()).
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def reserve(self, n: float = 1.0) -> float:
+        """Take n tokens (the balance may go negative) -> seconds to wait before proceeding."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= n
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, n: float = 1.0) -> None:
+        """Block until n tokens are available."""
+        wait = self.reserve(n)
+        if wait > 0:
+            time.sleep(wait)
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        """Take n tokens only if available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= n:
+                self._tokens -= n
+                return True
+            return False
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,70 @@
+# exchange/registry.py
+from __future__ import annotations
+from dataclasses import replace
+from typing import Dict, Optional, Tuple
+import threading
+import time
+
+from config.settings import get_settings
+from exchange.bybit_client import BybitClient
+
+# Long-lived, shared BybitClients: one per (account, testnet, category), created on first use
+# and reused by every caller in the process, so loops don't pay for settings parsing, session
+# setup and a TLS handshake on each call. pybit's HTTP session is safe to share between threads.
+
+HEALTH_EVERY = 300.0  # seconds between liveness checks (ping) of a shared client
+
+Key = Tuple[str, bool, str]
+
+class ClientRegistry:
+    def __init__(self, health_every: float = HEALTH_EVERY):
+        self.health_every = health_every
+        self._clients: Dict[Key, BybitClient] = {}
+        self._checked: Dict[Key, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: str = "", testnet: Optional[bool] = None, category: str = "linear") -> BybitClient:
+        """
+        Shared client for the key (testnet=None -> BYBIT_TESTNET). At most every health_every
+        seconds the client is pinged and its session rebuilt in place if the ping fails, so
+        holders of the client keep a working session.
+        """
+        settings = get_settings(account)
+        if testnet is None:
+            testnet = settings.testnet
+        key = (account, testnet, category)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                cfg = settings if settings.testnet == testnet else replace(settings, testnet=testnet)
+                client = self._clients[key] = BybitClient(cfg)
+                self._checked[key] = time.monotonic()
+                return client
+            due = time.monotonic() - self._checked[key] > self.health_every
+            if due:
+                self._checked[key] = time.monotonic()
+        if due and not client.ping():
+            client.reconnect()
+        return client
+
+    def reconnect(self, account: str = "", testnet: Optional[bool] = None, category: Optional[str] = None) -> None:
+        """Rebuild the sessions of matching clients now (None = any testnet/category)."""
+        with self._lock:
+            clients = [c for (a, t, cat), c in self._clients.items()
+                       if a == account and testnet in (None, t) and category in (None, cat)]
+        for c in clients:
+            c.reconnect()
+
+    def clear(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._checked.clear()
+        for c in clients:
+            c.session.client.close()
+
+REGISTRY = ClientRegistry()
+
+def get_client(account: str = "", testnet: Optional[bool] = None, category: str = "linear") -> BybitClient:
+    """Shorthand for REGISTRY.get(...)."""
+    return REGISTRY.get(account, testnet, category)
@@ -0,0 +1,196 @@
+# exchange/telemetry.py
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import json
+import threading
+import time
+
+import pandas as pd
+from pybit.exceptions import InvalidRequestError, FailedRequestError
+
+from core.logger import get_logger
+
+# Per-endpoint call telemetry for exchange clients: latency histogram, errors by retCode and
+# rate-limit headroom (Bybit's X-Bapi-Limit* headers). Recording is a couple of perf_counter
+# reads, a bisect and a lock, i.e. microseconds against millisecond round-trips.
+
+# histogram bucket upper bounds (seconds): 0.1 ms .. 100 s, 10 buckets per decade
+BOUNDS = [10 ** (k / 10) for k in range(-40, 21)]
+
+_tls = threading.local()  # headers of the last response on this thread (see attach())
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)  # last bucket: above BOUNDS[-1]
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(BOUNDS, seconds)] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (within one bucket, ~26%)."""
+        if self.n == 0:
+            return float("nan")
+        rank, seen = q * self.n, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(BOUNDS[i], self.max) if i < len(BOUNDS) else self.max
+        return self.max
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors: Counter = Counter()      # retCode / "http_<status>" / exception name -> count
+        self.limit: Optional[int] = None      # X-Bapi-Limit (requests per window)
+        self.remaining: Optional[int] = None  # X-Bapi-Limit-Status of the latest response
+        self.min_headroom: Optional[float] = None  # lowest remaining / limit seen
+
+    def record_limits(self, headers) -> None:
+        if not headers:
+            return
+        limit, remaining = headers.get("X-Bapi-Limit"), headers.get("X-Bapi-Limit-Status")
+        if limit is None or remaining is None:
+            return
+        self.limit, self.remaining = int(limit), int(remaining)
+        if self.limit > 0:
+            h = self.remaining / self.limit
+            self.min_headroom = h if self.min_headroom is None else min(self.min_headroom, h)
+
+class Telemetry:
+    """
+    Thread-safe registry of EndpointStats. Wrap exchange calls with call() (BybitClient does),
+    and attach() sessions so successful calls also report rate-limit headers.
+    Query in-process with summary() / snapshot(), or start_dump() for periodic logs.
+    """
+    def __init__(self):
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+        self._dumper: Optional[threading.Thread] = None
+        self._dump_stop = threading.Event()
+        self.since = time.time()
+
+    @staticmethod
+    def attach(session) -> None:
+        """Remember each response's headers (per thread) so call() can read the rate-limit headers."""
+        hooks = session.client.hooks["response"]
+        if _remember_headers not in hooks:
+            hooks.append(_remember_headers)
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """fn(*args, **kwargs), timed and recorded under `endpoint` (exceptions re-raised)."""
+        _tls.headers = None
+        code = None
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except InvalidRequestError as e:   # Bybit retCode != 0
+            code, _tls.headers = e.status_code, e.resp_headers
+            raise
+        except FailedRequestError as e:    # HTTP status != 200 / undecodable response
+            code, _tls.headers = f"http_{e.status_code}", e.resp_headers
+            raise
+        except Exception as e:             # network errors, timeouts, ...
+            code = type(e).__name__
+            raise
+        finally:
+            self.record(endpoint, time.perf_counter() - t0, code, _tls.headers)
+
+    def record(self, endpoint: str, seconds: float, error: Any = None, headers=None) -> None:
+        with self._lock:
+            st = self._stats.get(endpoint)
+            if st is None:
+                st = self._stats[endpoint] = EndpointStats()
+            st.latency.record(seconds)
+            if error is not None:
+                st.errors[error] += 1
+            st.record_limits(headers)
+
+    # ---------- queries ----------
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{endpoint: plain-dict stats} (JSON-safe)."""
+        with self._lock:
+            out = {}
+            for ep, st in self._stats.items():
+                h = st.latency
+                out[ep] = {
+                    "calls": h.n, "errors": {str(k): v for k, v in st.errors.items()},
+                    "total_s": h.total, "mean_ms": 1000 * h.total / h.n if h.n else None,
+                    "p50_ms": 1000 * h.quantile(0.5), "p90_ms": 1000 * h.quantile(0.9),
+                    "p99_ms": 1000 * h.quantile(0.99), "max_ms": 1000 * h.max,
+                    "limit": st.limit, "remaining": st.remaining, "min_headroom": st.min_headroom,
+                }
+            return out
+
+    def summary(self) -> pd.DataFrame:
+        """One row per endpoint, sorted by total time spent (the calls dominating a loop come first)."""
+        snap = self.snapshot()
+        if not snap:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_dict(snap, orient="index")
+        df["errors"] = df["errors"].map(lambda e: sum(e.values()))
+        df["err_pct"] = 100 * df["errors"] / df["calls"]
+        df["time_pct"] = 100 * df["total_s"] / df["total_s"].sum()
+        cols = ["calls", "errors", "err_pct", "total_s", "time_pct", "mean_ms", "p50_ms", "p90_ms",
+                "p99_ms", "max_ms", "limit", "remaining", "min_headroom"]
+        return df[cols].sort_values("total_s", ascending=False)
+
+    def errors(self) -> pd.DataFrame:
+        """(endpoint, code) -> count."""
+        with self._lock:
+            rows = [(ep, str(code), n) for ep, st in self._stats.items() for code, n in st.errors.items()]
+        return pd.DataFrame(rows, columns=["endpoint", "code", "count"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.since = time.time()
+
+    # ---------- periodic dump ----------
+    def dump(self, path: Optional[Path] = None, log=None) -> None:
+        """Log the summary; with path, also append the snapshot as one JSON line."""
+        summ = self.summary()
+        if summ.empty:
+            return
+        (log or get_logger("Telemetry")).info("Exchange calls since %s:\n%s",
+            datetime.fromtimestamp(self.since, timezone.utc).isoformat(timespec="seconds"),
+            summ.to_string(float_format=lambda x: f"{x:.1f}"))
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a") as f:
+                f.write(json.dumps({"time": datetime.now(timezone.utc).isoformat(), "since": self.since,
+                                    "endpoints": self.snapshot()}) + "\n")
+
+    def start_dump(self, every: float = 300.0, path: Optional[Path] = None, log=None) -> None:
+        """dump() every `every` seconds from a daemon thread (until stop_dump())."""
+        if self._dumper is not None and self._dumper.is_alive():
+            return
+        self._dump_stop.clear()
+
+        def run():
+            while not self._dump_stop.wait(every):
+                try:
+                    self.dump(path, log)
+                except Exception as e:
+                    (log or get_logger("Telemetry")).error("Telemetry dump failed: %s", e)
+        self._dumper = threading.Thread(target=run, name="telemetry-dump", daemon=True)
+        self._dumper.start()
+
+    def stop_dump(self) -> None:
+        self._dump_stop.set()
+
+def _remember_headers(response, *args, **kwargs):
+    _tls.headers = response.headers
+
+# process-wide instance used by BybitClient (and the async clients built on it)
+TELEMETRY = Telemetry()
@@ -3,17 +3,21 @@ from __future__ import annotations
 import time
 import signal
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional, Literal, Dict, Any
 
-from data.market_data import fetch_ohlcv, add_atr
+from data.store import load_ohlcv
+from data.feed import Feed, append_bar, with_forming_bar
 from strategy.base import Strategy
 from orders.executor import OrderExecutor, BracketConfig
-from exchange.bybit_client import BybitClient
+from exchange.registry import get_client
 from core.logger import get_logger
-from config.settings import load_env
+from config.settings import get_settings
 
 Side = Literal["Buy", "Sell"]
 
+_LIVE_BARS = 300  # candles handed to the strategy per bar (closed + forming)
+
 @dataclass
 class LiveConfig:
     symbol: str = "BTCUSDT"
@@ -24,15 +28,19 @@ class LiveConfig:
     atr_mult_sl: float = 1.0
     atr_mult_tp: float = 2.0
     poll_seconds: int = 5
+    telemetry_every: int = 300        # seconds between exchange-call summaries (0 = off)
+    telemetry_path: Path = Path("reports/telemetry.jsonl")
 
 class LiveRunner:
-    def __init__(self, strategy: Strategy, cfg: LiveConfig):
+    def __init__(self, strategy: Strategy, cfg: LiveConfig, feed: Optional[Feed] = None):
         self.cfg = cfg
+        self.feed = feed  # push-based bars (e.g. WsKlineFeed); None = poll REST every poll_seconds
         self.strategy = strategy
-        self.settings = load_env()
+        self.settings = get_settings()
         self.log = get_logger("LiveRunner", self.settings.log_level)
-        self.client = BybitClient()
+        self.client = get_client(category=cfg.category)
         self.exec = OrderExecutor(self.client)
+        self.exec.catalog.load(cfg.category)  # instrument specs up front: orders are built offline
         self.bracket_cfg = BracketConfig(
             risk_pct=cfg.risk_pct,
             atr_mult_sl=cfg.atr_mult_sl,
@@ -45,12 +53,16 @@ class LiveRunner:
         signal.signal(signal.SIGTERM, self._sig_stop)
 
         self._resting_order_id: Optional[str] = None  # entry order waiting to fill
+        self._resting_side: Optional[Side] = None
         self._last_seen_bar_ts = None
+        self._last_fed_bar_ts = None  # last closed bar fed to strategy.on_bar()
 
     # ----- signal handling -----
     def _sig_stop(self, *args):
         self.log.warning("Stop signal received. Attempting graceful shutdown...")
         self._stop = True
+        if self.feed is not None:
+            self.feed.stop()  # unblocks the event loop
 
     # ----- exchange state helpers -----
     def get_open_position(self) -> Dict[str, Any] | None:
@@ -80,6 +92,7 @@ class LiveRunner:
             self.log.error("Cancel error: %s", e)
         finally:
             self._resting_order_id = None
+            self._resting_side = None
 
     def close_position_market(self, pos: Dict[str, Any]):
         """Emergency/flip close using reduceOnly market order."""
@@ -102,23 +115,129 @@ class LiveRunner:
         except Exception as e:
             self.log.error("Close market error: %s", e)
 
+    # ----- per-bar logic -----
+    def _on_new_bar(self, df):
+        """A new bar just opened: df = closed bars + the newest (forming) bar as last row."""
+        last = df.iloc[-1]
+
+        # 1) Fetch the client through the registry each bar: that runs its periodic health check
+        #    (ping, reconnect in place), which nothing else triggers in feed mode
+        self.client = self.exec.client = get_client(category=self.cfg.category)
+
+        # 2) Check exchange state
+        pos = self.get_open_position()
+
+        # 3) Generate a signal: stream only the newly closed bar(s) into the strategy
+        #    (O(1) per bar); full recompute only if it has no on_bar() support
+        sig, self._last_fed_bar_ts = self.strategy.catch_up(df.iloc[:-1], self._last_fed_bar_ts)
+        if sig is None:
+            sig = self.strategy.generate_signal(df.iloc[:-1])  # closed bars only
+        s = sig.get("signal", "FLAT")
+        reason = sig.get("reason", "?")
+        meta = sig.get("meta", {})
+        atr = float(meta.get("atr14") or 0.0) or float(df["close"].iloc[-1] * 0.005)
+
+        self.log.info("Signal %s (%s) | price=%.4f | atr=%.4f | in_pos=%s",
+                      s, reason, float(last["close"]), atr, bool(pos))
+
+        # 4) Handle cases
+        if s == "FLAT":
+            # If we have a resting entry and strategy is FLAT, cancel it
+            if self._resting_order_id:
+                self.cancel_resting_entry()
+            # Do not force-close active positions here; let TP/SL manage them
+            return
+
+        # LONG or SHORT signal:
+        desired_side: Side = "Buy" if s == "LONG" else "Sell"
+
+        # 4a) If position exists and it's the SAME direction → do nothing (let TP/SL manage)
+        if pos and ((pos["side"] == "LONG" and s == "LONG") or (pos["side"] == "SHORT" and s == "SHORT")):
+            self.log.info("Already in %s, keeping position.", pos["side"])
+            return
+
+        # 4b) If position exists in the OPPOSITE direction → close it then (optionally) re-enter
+        if pos and ((pos["side"] == "LONG" and s == "SHORT") or (pos["side"] == "SHORT" and s == "LONG")):
+            self.log.warning("Flip detected: %s -> %s", pos["side"], s)
+            self.close_position_market(pos)
+            # clear any resting entry just in case
+            self.cancel_resting_entry()
+            # fall through to build a fresh entry after close
+
+        # 4c) No position → build and place a new bracket entry off current bar OPEN
+        # For safety, use PostOnly LIMIT a little away from market so we don't cross.
+        open_px = float(last["open"])
+        equity = self.cfg.equity_hint  # You can wire actual equity from balances later
+
+        # Small nudge: if LONG, place slightly below open; if SHORT, slightly above
+        entry_px = open_px * (0.998 if s == "LONG" else 1.002)
+
+        order = self.exec.build_bracket(
+            symbol=self.cfg.symbol,
+            side=desired_side,
+            entry_px=entry_px,
+            atr=atr,
+            equity=equity,
+            cfg=self.bracket_cfg,
+        )
+        fields = {k: order[k] for k in ("side", "price", "qty", "takeProfit", "stopLoss")}
+
+        if self._resting_order_id and self._resting_side == desired_side:
+            # still waiting on an entry the same way: re-quote it in place (amend keeps our
+            # maker queue position; cancel+replace only if the amend is rejected)
+            self.log.info("Re-quoting %s: %s", self._resting_order_id, fields)
+            res = self.exec.requote(self._resting_order_id, order)
+            self._resting_order_id = res["orderId"]
+            if not self._resting_order_id:
+                self._resting_side = None
+                self.log.info("Resting entry not replaced; re-checking position on the next bar")
+            elif not res["amended"]:
+                self.log.info("Replaced resting entry -> orderId=%s", self._resting_order_id)
+            return
+
+        if self._resting_order_id:
+            self.cancel_resting_entry()  # opposite side: drop it
+        self.log.info("Placing bracket: %s", fields)
+        resp = self.exec.submit(order)
+        self._resting_order_id = resp.get("result", {}).get("orderId")
+        self._resting_side = desired_side if self._resting_order_id else None
+        if self._resting_order_id:
+            self.log.info("Resting entry orderId=%s", self._resting_order_id)
+        else:
+            self.log.warning("No orderId returned. Response: %s", str(resp)[:300])
+
     # ----- main loop -----
     def run(self):
-        self.log.info("Live runner starting (symbol=%s, tf=%sm, testnet=%s)",
-                      self.cfg.symbol, self.cfg.interval, self.settings.testnet)
+        self.log.info("Live runner starting (symbol=%s, tf=%sm, testnet=%s, feed=%s)",
+                      self.cfg.symbol, self.cfg.interval, self.settings.testnet,
+                      type(self.feed).__name__ if self.feed else "poll")
+        if self.cfg.telemetry_every:
+            self.client.telemetry.start_dump(self.cfg.telemetry_every, self.cfg.telemetry_path, self.log)
+        if self.feed is not None:
+            self._run_feed()
+        else:
+            self._run_poll()
 
+        # graceful shutdown: cancel any resting entry
+        self.cancel_resting_entry()
+        if self.cfg.telemetry_every:
+            self.client.telemetry.stop_dump()
+            self.client.telemetry.dump(self.cfg.telemetry_path, self.log)
+        self.log.info("Live runner stopped.")
+
+    def _run_poll(self):
         while not self._stop:
             try:
-                # 1) Pull recent candles; last row is the latest CLOSED bar
-                df = fetch_ohlcv(self.cfg.symbol, self.cfg.interval, limit=300, category=self.cfg.category)
-                df["atr14"] = add_atr(df, 14)
-                last = df.iloc[-1]
-                prev = df.iloc[-2]
-                last_ts = last.name  # datetime index
+                # 1) Recent candles from the local store (syncs only bars newer than the last stored one);
+                #    last row is the latest CLOSED bar
+                df = load_ohlcv(self.cfg.symbol, self.cfg.interval, limit=_LIVE_BARS, category=self.cfg.category)
+                last_ts = df.index[-1]
 
                 # Only act when a NEW bar has closed
                 if self._last_seen_bar_ts is None:
                     self._last_seen_bar_ts = last_ts
+                    # one-time warmup of the streaming strategy on the closed history
+                    _, self._last_fed_bar_ts = self.strategy.catch_up(df.iloc[:-1])
                     self.log.info("Initialized on closed bar %s", last_ts)
                     time.sleep(self.cfg.poll_seconds)
                     continue
@@ -129,77 +248,31 @@ class LiveRunner:
 
                 # New bar closed -> process previous bar for exits/logic, and use current bar OPEN for new entries
                 self._last_seen_bar_ts = last_ts
-
-                # 2) Check exchange state
-                pos = self.get_open_position()
-
-                # 3) Generate a signal from strategy (using all data up to latest closed bar)
-                sig = self.strategy.generate_signal(df)
-                s = sig.get("signal", "FLAT")
-                reason = sig.get("reason", "?")
-                meta = sig.get("meta", {})
-                atr = float(meta.get("atr14") or 0.0) or float(df["close"].iloc[-1] * 0.005)
-
-                self.log.info("Signal %s (%s) | price=%.4f | atr=%.4f | in_pos=%s",
-                              s, reason, float(last["close"]), atr, bool(pos))
-
-                # 4) Handle cases
-                if s == "FLAT":
-                    # If we have a resting entry and strategy is FLAT, cancel it
-                    if self._resting_order_id:
-                        self.cancel_resting_entry()
-                    # Do not force-close active positions here; let TP/SL manage them
-                    time.sleep(self.cfg.poll_seconds)
-                    continue
-
-                # LONG or SHORT signal:
-                desired_side: Side = "Buy" if s == "LONG" else "Sell"
-
-                # 4a) If position exists and it's the SAME direction → do nothing (let TP/SL manage)
-                if pos and ((pos["side"] == "LONG" and s == "LONG") or (pos["side"] == "SHORT" and s == "SHORT")):
-                    self.log.info("Already in %s, keeping position.", pos["side"])
-                    time.sleep(self.cfg.poll_seconds)
-                    continue
-
-                # 4b) If position exists in the OPPOSITE direction → close it then (optionally) re-enter
-                if pos and ((pos["side"] == "LONG" and s == "SHORT") or (pos["side"] == "SHORT" and s == "LONG")):
-                    self.log.warning("Flip detected: %s -> %s", pos["side"], s)
-                    self.close_position_market(pos)
-                    # clear any resting entry just in case
-                    self.cancel_resting_entry()
-                    # fall through to build a fresh entry after close
-
-                # 4c) No position → build and place a new bracket entry off current bar OPEN
-                # For safety, use PostOnly LIMIT a little away from market so we don't cross.
-                open_px = float(last["open"])
-                equity = self.cfg.equity_hint  # You can wire actual equity from balances later
-
-                # Small nudge: if LONG, place slightly below open; if SHORT, slightly above
-                entry_px = open_px * (0.998 if s == "LONG" else 1.002)
-
-                order = self.exec.build_bracket(
-                    symbol=self.cfg.symbol,
-                    side=desired_side,
-                    entry_px=entry_px,
-                    atr=atr,
-                    equity=equity,
-                    cfg=self.bracket_cfg,
-                )
-                self.log.info("Placing bracket: %s", {k: order[k] for k in ("side", "price", "qty", "takeProfit", "stopLoss")})
-
-                resp = self.exec.submit(order)
-                self._resting_order_id = resp.get("result", {}).get("orderId")
-                if self._resting_order_id:
-                    self.log.info("Resting entry orderId=%s", self._resting_order_id)
-                else:
-                    self.log.warning("No orderId returned. Response: %s", str(resp)[:300])
-
+                self._on_new_bar(df)
                 time.sleep(self.cfg.poll_seconds)
 
             except Exception as e:
                 self.log.error("Live loop error: %s", e)
                 time.sleep(3)
 
-        # graceful shutdown: cancel any resting entry
-        self.cancel_resting_entry()
-        self.log.info("Live runner stopped.")
+    def _run_feed(self):
+        """Event-driven loop: act as soon as the feed confirms a bar close (no polling)."""
+        closed = self.feed.history(_LIVE_BARS - 1)
+        _, self._last_fed_bar_ts = self.strategy.catch_up(closed)  # one-time warmup
+        self.log.info("Initialized on closed bar %s", closed.index[-1] if len(closed) else None)
+        self.feed.start()
+        try:
+            for ev in self.feed:
+                if self._stop:
+                    break
+                if not ev.confirmed:
+                    continue
+                try:
+                    closed = append_bar(closed, ev, _LIVE_BARS - 1)
+                    df = with_forming_bar(closed, self.cfg.interval)
+                    self._last_seen_bar_ts = df.index[-1]
+                    self._on_new_bar(df)
+                except Exception as e:
+                    self.log.error("Live loop error: %s", e)
+        finally:
+            self.feed.stop()
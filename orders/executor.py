@@ -1,13 +1,25 @@
 # orders/executor.py
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Any, Dict, Iterable, List, Optional, Literal, Tuple, Union
 
 from exchange.bybit_client import BybitClient
+from exchange.registry import get_client
+from exchange.instruments import InstrumentCatalog
+from pybit.exceptions import InvalidRequestError
 from risk.manager import position_size, propose_levels
 
 Side = Literal["Buy", "Sell"]
 
+# Bybit v5 batch endpoints: max orders per request, by category
+BATCH_LIMITS = {"linear": 20, "inverse": 20, "option": 20, "spot": 10}
+BATCH_WORKERS = 8  # batch requests in flight at once
+
+# fields amend_order can change in place (build_bracket() order keys)
+AMEND_FIELDS = ("price", "qty", "takeProfit", "stopLoss")
+NOT_MODIFIED = 34040  # retCode when an amend changes nothing
+
 @dataclass
 class BracketConfig:
     risk_pct: float = 0.01     # e.g., 1% of equity per trade
@@ -22,23 +34,29 @@ class OrderExecutor:
     - round qty/price to exchange rules
     - place a single entry with TP/SL attached (tpslMode=Full)
     """
-    def __init__(self, client: Optional[BybitClient] = None):
-        self.client = client or BybitClient()
+    def __init__(self, client: Optional[BybitClient] = None, catalog: Optional[InstrumentCatalog] = None):
+        self.client = client or get_client()
+        # instrument specs served from memory (bulk-loaded per category), so building an order
+        # doesn't hit the network
+        self.catalog = catalog or InstrumentCatalog(self.client)
+        self._pool: Optional[ThreadPoolExecutor] = None  # for concurrent batch chunks
 
-    # ---- Rounding helpers from the client ----
-    def _qty_round(self, qty: float, symbol: str) -> float:
-        min_qty, step = self.client.get_min_qty(symbol, self.client.cfg.runtime_mode == "live" and "linear" or "linear")
+    # ---- Rounding helpers from the instrument catalog ----
+    def _qty_round(self, qty: float, symbol: str, category: str = "linear") -> float:
+        spec = self.catalog.get(symbol, category)
+        step = spec.qty_step if spec else None
         if step in (None, 0,):
             return qty
         # snap down to a valid step so we never go under min due to rounding
         snapped = int(qty / step) * step
         # ensure we don't fall below min
-        if snapped < min_qty:
-            snapped = min_qty
+        if snapped < spec.min_qty:
+            snapped = spec.min_qty
         return round(snapped, 12)
 
-    def _price_round(self, px: float, symbol: str) -> float:
-        tick = self.client.get_tick_size(symbol)
+    def _price_round(self, px: float, symbol: str, category: str = "linear") -> float:
+        spec = self.catalog.get(symbol, category)
+        tick = spec.tick_size if spec else None
         if not tick or tick <= 0:
             return px
         snapped = round(round(px / tick) * tick, 12)
@@ -63,8 +81,8 @@ class OrderExecutor:
         """
         # 1) SL/TP proposal
         lvls = propose_levels(entry_px, atr, cfg.atr_mult_sl, cfg.atr_mult_tp, side=side)
-        sl_px = self._price_round(lvls["sl"], symbol)
-        tp_px = self._price_round(lvls["tp"], symbol)
+        sl_px = self._price_round(lvls["sl"], symbol, cfg.category)
+        tp_px = self._price_round(lvls["tp"], symbol, cfg.category)
 
         # 2) Stop distance
         stop_distance = abs(entry_px - sl_px)
@@ -73,10 +91,10 @@ class OrderExecutor:
 
         # 3) Quantity from risk
         qty = position_size(equity, cfg.risk_pct, stop_distance)
-        qty = self._qty_round(qty, symbol)
+        qty = self._qty_round(qty, symbol, cfg.category)
 
         # 4) Round entry price
-        entry_px = self._price_round(entry_px, symbol)
+        entry_px = self._price_round(entry_px, symbol, cfg.category)
 
         # 5) Build order payload for Bybit
         #    Use tpslMode="Full" to apply TP/SL to the whole position size.
@@ -110,12 +128,137 @@ class OrderExecutor:
             stopLoss=order.get("stopLoss"),
         )
 
-    def amend(self, symbol: str, order_id: str, **fields) -> dict:
-        # Bybit uses 'amend_order' with flexible fields; in pybit it's place_order/cancel/amend depending on version.
-        # If your pybit has amend support exposed, call it here; otherwise cancel & re-place.
-        # For now, we keep a simple placeholder:
-        # (You can implement self.client.session.amend_order(...) if your SDK exposes it)
-        return {"note": "Implement amend via SDK if available", "requested_fields": fields}
+    def amend(self, symbol: str, order_id: str, category: str = "linear", **fields) -> dict:
+        """
+        Modify a resting order in place (keeps its queue position): fields are API names, e.g.
+        price=, qty=, takeProfit=, stopLoss=. Prices/qty are rounded like build_bracket() does.
+        Raises pybit's InvalidRequestError if Bybit rejects the amend.
+        """
+        for k in ("price", "takeProfit", "stopLoss", "triggerPrice"):
+            if fields.get(k) is not None:
+                fields[k] = self._price_round(float(fields[k]), symbol, category)
+        if fields.get("qty") is not None:
+            fields["qty"] = self._qty_round(float(fields["qty"]), symbol, category)
+        fields = {k: v for k, v in fields.items() if v is not None}
+        return self.client.amend_order(symbol, order_id=order_id, category=category, **fields)
+
+    def requote(self, order_id: str, order: dict) -> dict:
+        """
+        Move a resting order to a freshly built order's price/qty/TP/SL: amend in place (one
+        round-trip, keeps maker queue priority); only if Bybit rejects the amend (order gone,
+        field not amendable, ...) cancel it and place `order` instead. If the cancel fails too
+        (e.g. the order just filled) nothing is placed and orderId is None: the caller's next
+        position check decides what to do.
+        Returns {"orderId", "amended": bool, "response"}.
+        """
+        category = order.get("category", "linear")
+        fields = {k: order[k] for k in AMEND_FIELDS if order.get(k) is not None}
+        try:
+            resp = self.amend(order["symbol"], order_id, category, **fields)
+            return {"orderId": resp.get("result", {}).get("orderId") or order_id, "amended": True, "response": resp}
+        except InvalidRequestError as e:
+            if e.status_code == NOT_MODIFIED:
+                return {"orderId": order_id, "amended": True, "response": None}
+            self.client.log.warning("Amend of %s rejected (%s); cancel and replace", order_id, e.status_code)
+        try:
+            self.cancel(order["symbol"], order_id, category)
+        except InvalidRequestError as e:
+            self.client.log.warning("Cancel of %s failed (%s); not placing a replacement", order_id, e.status_code)
+            return {"orderId": None, "amended": False, "response": None}
+        resp = self.submit(order)
+        return {"orderId": resp.get("result", {}).get("orderId"), "amended": False, "response": resp}
 
     def cancel(self, symbol: str, order_id: str, category: str = "linear") -> dict:
         return self.client.cancel_order(symbol, order_id=order_id, category=category)
+
+    # ---- Batch: many orders in few round-trips ----
+    def submit_many(self, orders: List[dict]) -> List[dict]:
+        """
+        Place many build_bracket()-style orders through the batch endpoint: grouped by category,
+        split into BATCH_LIMITS chunks, chunks sent concurrently. Returns one result per order,
+        in input order: {"symbol", "orderId", "orderLinkId", "ok", "code", "msg"}.
+        """
+        by_cat: Dict[str, List[int]] = {}
+        for i, o in enumerate(orders):
+            by_cat.setdefault(o.get("category", "linear"), []).append(i)
+        jobs = [(self.client.place_batch_order, cat, [_batch_item(orders[i]) for i in idx], idx)
+                for cat, idx in by_cat.items()]
+        return self._run_batches(jobs, len(orders))
+
+    def cancel_many(self, orders: Iterable[Union[Tuple[str, str], dict]], category: str = "linear") -> List[dict]:
+        """
+        Cancel many orders, given as (symbol, order_id) pairs or {"symbol", "orderId"|"orderLinkId"}
+        dicts (e.g. submit_many() results). Same chunking and result shape as submit_many().
+        """
+        items = [{"symbol": o[0], "orderId": o[1]} if isinstance(o, tuple) else
+                 {k: o[k] for k in ("symbol", "orderId", "orderLinkId") if o.get(k)} for o in orders]
+        return self._run_batches([(self.client.cancel_batch_order, category, items, list(range(len(items))))],
+                                 len(items))
+
+    def cancel_all(self, symbols: Optional[Iterable[str]] = None, category: str = "linear",
+                   settle_coin: Optional[str] = "USDT") -> Dict[str, Any]:
+        """
+        Cancel every open order: per symbol (concurrently) when symbols are given, otherwise in one
+        call for the whole category (derivatives: all orders settled in settle_coin).
+        Returns {symbol or "ALL": response or the exception raised}.
+        """
+        if symbols is None:
+            extra = {"settleCoin": settle_coin} if settle_coin and category in ("linear", "inverse") else {}
+            return {"ALL": self.client.cancel_all_orders(category=category, **extra)}
+        symbols = list(symbols)
+        futs = [self._executor().submit(self.client.cancel_all_orders, symbol=s, category=category) for s in symbols]
+        out = {}
+        for s, f in zip(symbols, futs):
+            try:
+                out[s] = f.result()
+            except Exception as e:
+                out[s] = e
+        return out
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+        return self._pool
+
+    def _run_batches(self, jobs, n: int) -> List[dict]:
+        """jobs: (client batch fn, category, items, input positions) -> results in input order."""
+        results: List[Optional[dict]] = [None] * n
+        futs = []
+        for fn, cat, items, idx in jobs:
+            size = BATCH_LIMITS.get(cat, 10)
+            for k in range(0, len(items), size):
+                chunk = items[k:k + size]
+                futs.append((chunk, idx[k:k + size], self._executor().submit(fn, request=chunk, category=cat)))
+        for chunk, pos, fut in futs:
+            try:
+                per_order = _batch_results(fut.result(), chunk)
+            except Exception as e:  # whole chunk failed (network, auth, retCode != 0)
+                code = getattr(e, "status_code", None)
+                per_order = [{"symbol": it["symbol"], "orderId": it.get("orderId"), "orderLinkId": it.get("orderLinkId"),
+                              "ok": False, "code": code, "msg": str(e)} for it in chunk]
+            for p, r in zip(pos, per_order):
+                results[p] = r
+        return results
+
+def _batch_item(order: dict) -> dict:
+    """build_bracket()-style order -> batch request item (API field names, numbers as strings)."""
+    item = {"symbol": order["symbol"], "side": order["side"], "orderType": order.get("order_type", "Limit")}
+    for k, v in order.items():
+        if k in ("category", "order_type", "symbol", "side") or v is None:
+            continue
+        item[k] = str(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else v
+    return item
+
+def _batch_results(resp: dict, chunk: List[dict]) -> List[dict]:
+    """Batch response -> one result per request item (result.list / retExtInfo.list are in request order)."""
+    rows = (resp.get("result", {}) or {}).get("list", []) or []
+    codes = (resp.get("retExtInfo", {}) or {}).get("list", []) or []
+    out = []
+    for i, it in enumerate(chunk):
+        r = rows[i] if i < len(rows) else {}
+        c = codes[i] if i < len(codes) else {"code": resp.get("retCode", -1), "msg": resp.get("retMsg", "missing result")}
+        out.append({"symbol": r.get("symbol") or it["symbol"],
+                    "orderId": r.get("orderId") or it.get("orderId"),
+                    "orderLinkId": r.get("orderLinkId") or it.get("orderLinkId"),
+                    "ok": c.get("code") == 0, "code": c.get("code"), "msg": c.get("msg")})
+    return out
@@ -8,12 +8,18 @@ from pathlib import Path
 
 import pandas as pd
 
-from data.market_data import fetch_ohlcv, add_atr
+from data.indicator_cache import indicator
+from data.store import load_ohlcv
+from data.feed import Feed, append_bar, with_forming_bar
 from strategy.base import Strategy
 from risk.manager import position_size, propose_levels
+from backtest.exits import bar_exit, find_exit, hits_both
+from backtest.intrabar import IntrabarResolver
 
 Mode = Literal["replay", "live"]
 
+_LIVE_BARS = 300  # candles per live tick (closed + forming)
+
 @dataclass
 class PaperConfig:
     symbol: str = "BTCUSDT"
@@ -26,6 +32,7 @@ class PaperConfig:
     fee_bps: float = 2.0          # 0.02% per side
     slippage_bps: float = 1.0     # 0.01% per side
     report_path: Path = Path("reports/paper_trades.csv")
+    intrabar: bool = False        # resolve bars touching both SL and TP from 1m candles (else SL first)
 
 def _bps(price: float, bps: float) -> float:
     return price * (bps / 10_000.0)
@@ -51,6 +58,8 @@ class PaperRunner:
         self.tp_px = None
         self.entry_time = None
 
+        self.intrabar = IntrabarResolver(cfg.symbol, cfg.interval, cfg.category) if cfg.intrabar else None
+
         _ensure_report_header(cfg.report_path)
 
     # ======== core simulation helpers ========
@@ -60,35 +69,16 @@ class PaperRunner:
         if not self.in_pos:
             return None
 
-        high = float(bar.high)
-        low = float(bar.low)
-        ts = bar.Index
-
-        exit_reason = None
-        exit_px = None
-
-        if self.pos_side == "LONG":
-            hit_sl = (low <= self.sl_px)
-            hit_tp = (high >= self.tp_px)
-            if hit_sl and hit_tp:
-                exit_reason, exit_px = "SL", self.sl_px
-            elif hit_sl:
-                exit_reason, exit_px = "SL", self.sl_px
-            elif hit_tp:
-                exit_reason, exit_px = "TP", self.tp_px
-        else:  # SHORT
-            hit_sl = (high >= self.sl_px)
-            hit_tp = (low <= self.tp_px)
-            if hit_sl and hit_tp:
-                exit_reason, exit_px = "SL", self.sl_px
-            elif hit_sl:
-                exit_reason, exit_px = "SL", self.sl_px
-            elif hit_tp:
-                exit_reason, exit_px = "TP", self.tp_px
-
+        exit_reason, exit_px = bar_exit(self.pos_side, float(bar.high), float(bar.low), self.sl_px, self.tp_px)
         if not exit_reason:
             return None
+        if self.intrabar and hits_both(self.pos_side, float(bar.high), float(bar.low), self.sl_px, self.tp_px):
+            exit_reason = self.intrabar.resolve(self.pos_side, self.sl_px, self.tp_px, bar.Index)
+            exit_px = self.sl_px if exit_reason == "SL" else self.tp_px
+        return self._close_position(bar.Index, exit_reason, exit_px)
 
+    def _close_position(self, ts, exit_reason: str, exit_px: float) -> Dict:
+        """Book the exit at exit_px (SL/TP level) and go flat; returns the trade dict."""
         # costs
         slip = _bps(exit_px, self.cfg.slippage_bps)
         fee = _bps(exit_px, self.cfg.fee_bps)
@@ -157,43 +147,60 @@ class PaperRunner:
 
     # ======== modes ========
 
-    def run_replay(self, lookback_bars: int = 500):
-        """Fast replay of the last N bars (bar-by-bar)."""
-        df = fetch_ohlcv(self.cfg.symbol, self.cfg.interval, lookback_bars, self.cfg.category)
-        # ATR column for convenience
-        df["atr14"] = add_atr(df, 14)
-
-        rows = list(df.itertuples())
+    def run_replay(self, lookback_bars: int = 500, df: Optional[pd.DataFrame] = None):
+        """Fast replay of the last N bars (bar-by-bar). Pass df to replay given candles instead of fetching."""
+        if df is None:
+            df = load_ohlcv(self.cfg.symbol, self.cfg.interval, lookback_bars, self.cfg.category)
+        # ATR column for convenience (assign: never mutates a caller's frame)
+        df = df.assign(atr14=indicator(df, "atr", period=14))  # cached: the strategy reuses it
+
+        index = df.index
+        opens = df["open"].to_numpy(dtype=float)
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
+        closes = df["close"].to_numpy(dtype=float)
+        n = len(df)
         start = max(self.strat.warmup(), 2)
 
-        for i in range(start, len(rows) - 1):
-            cur = rows[i]
-            nxt = rows[i + 1]
-            df_slice = df.iloc[: i + 1]
-
-            # 1) exit check on current bar
-            maybe = self._maybe_exit_on_bar(cur)
-            if maybe:
-                self._append_trade(maybe, mode="replay")
+        # one vectorized pass if the strategy supports it
+        batch = self.strat.generate_signals(df)
+        if batch is not None:
+            batch_sig = batch["signal"].to_numpy()
+            batch_atr = batch["atr14"].to_numpy(dtype=float)
+
+        i = start
+        while i < n - 1:
+            # 1) in position: jump straight to the first bar that touches SL/TP
+            if self.in_pos:
+                j, reason = find_exit(highs, lows, i, n - 1, self.pos_side, self.sl_px, self.tp_px)
+                if j < 0:
+                    break  # still open at the end -> final close-out below
+                i = j
+                if self.intrabar and hits_both(self.pos_side, highs[i], lows[i], self.sl_px, self.tp_px):
+                    reason = self.intrabar.resolve(self.pos_side, self.sl_px, self.tp_px, index[i])
+                exit_px = self.sl_px if reason == "SL" else self.tp_px
+                self._append_trade(self._close_position(index[i], reason, exit_px), mode="replay")
 
             # 2) entry decision for next bar
-            if not self.in_pos:
-                sig = self.strat.generate_signal(df_slice)
-                if sig["signal"] in ("LONG", "SHORT"):
-                    atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(df_slice["close"].iloc[-1] * 0.005)
-                    self._enter_next_open(next_bar_open=float(nxt.open), atr=atr, signal=sig["signal"], next_ts=nxt.Index)
+            if batch is not None:
+                sig = {"signal": batch_sig[i], "meta": {"atr14": batch_atr[i]}}
+            else:
+                sig = self.strat.generate_signal(df.iloc[: i + 1])
+            if sig["signal"] in ("LONG", "SHORT"):
+                atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(closes[i] * 0.005)
+                self._enter_next_open(next_bar_open=float(opens[i + 1]), atr=atr, signal=sig["signal"], next_ts=index[i + 1])
+            i += 1
 
         # final close-out: if still in position, close at last close (optional)
         if self.in_pos:
-            last = rows[-1]
-            last_close = float(last.close)
+            last_close = float(closes[-1])
             fee = _bps(last_close, self.cfg.fee_bps)
             slip = _bps(last_close, self.cfg.slippage_bps)
             exit_px = last_close - fee - slip if self.pos_side == "LONG" else last_close + fee + slip
             pnl_per = (exit_px - self.entry_px) if self.pos_side == "LONG" else (self.entry_px - exit_px)
             self.equity += pnl_per * self.qty
             self._append_trade({
-                "time": last.Index.isoformat(),
+                "time": index[-1].isoformat(),
                 "symbol": self.cfg.symbol,
                 "side": self.pos_side,
                 "entry_px": self.entry_px,
@@ -206,19 +213,51 @@ class PaperRunner:
             }, mode="replay")
             self.in_pos = False
 
-    def run_live(self, poll_seconds: int = 5):
+    def _live_tick(self, df: pd.DataFrame, last_fed_ts):
+        """
+        One live step after a bar closed: df = closed bars + the newly opened bar (last row).
+        Exits on the closed bar, then entries at the new bar's open. Returns the new last_fed_ts.
+        """
+        prev_row = df.iloc[-2: -1].itertuples().__next__()
+        cur_row = df.iloc[-1:].itertuples().__next__()  # used for next open
+
+        # 1) exit on prev bar (closed)
+        maybe = self._maybe_exit_on_bar(prev_row)
+        if maybe:
+            self._append_trade(maybe, mode="live")
+
+        # 2) stream the newly closed bar(s) into the strategy (O(1) per bar; the
+        #    first tick primes it once), full recompute only if it has no on_bar() support
+        sig, last_fed_ts = self.strat.catch_up(df.iloc[:-1], last_fed_ts)
+
+        # 3) entry on new bar open
+        if not self.in_pos:
+            if sig is None:
+                sig = self.strat.generate_signal(df.iloc[:-1])  # closed bars only
+            if sig["signal"] in ("LONG", "SHORT"):
+                atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(df["close"].iloc[-1] * 0.005)
+                next_open = float(cur_row.open)  # open of the newest bar
+                self._enter_next_open(next_open, atr, sig["signal"], cur_row.Index)
+
+        # small heartbeat print (optional)
+        print(f"[{datetime.now(timezone.utc).isoformat()}] Live tick @ {cur_row.Index} | equity={self.equity:.2f} | in_pos={self.in_pos}")
+        return last_fed_ts
+
+    def run_live(self, poll_seconds: int = 5, feed: Optional[Feed] = None):
         """
         Waits for new bars to CLOSE.
         For a 15m interval, we only act when a fresh completed candle appears.
+        With a feed (WsKlineFeed, ReplayFeed) bar closes are pushed and handled immediately;
+        otherwise the store is polled every poll_seconds.
         """
+        if feed is not None:
+            return self._run_feed(feed)
         last_seen_ts = None
+        last_fed_ts = None  # last closed bar fed to strat.on_bar()
         while True:
             try:
-                df = fetch_ohlcv(self.cfg.symbol, self.cfg.interval, 300, self.cfg.category)
-                df["atr14"] = add_atr(df, 14)
-                cur = df.iloc[-1]           # last closed bar
-                prev = df.iloc[-2]          # previous bar
-                ts = cur.name               # datetime index
+                df = load_ohlcv(self.cfg.symbol, self.cfg.interval, _LIVE_BARS, self.cfg.category)  # incremental sync
+                ts = df.index[-1]           # datetime index of the newest bar
 
                 if last_seen_ts is None:
                     last_seen_ts = ts  # initialize
@@ -227,30 +266,10 @@ class PaperRunner:
                     time.sleep(poll_seconds)
                     continue
 
-                # NEW bar arrived → process the previous closed bar (`prev`) for exits,
+                # NEW bar arrived → process the previous closed bar for exits,
                 # and the new bar open for entries.
-                # Convert prev to a namedtuple-like for reuse
-                prev_row = df.iloc[-2: -1].itertuples().__next__()
-                cur_row = df.iloc[-1:].itertuples().__next__()  # used for next open
-                df_slice = df.iloc[:-0]  # full df up to current last
-
-                # 1) exit on prev bar (closed)
-                maybe = self._maybe_exit_on_bar(prev_row)
-                if maybe:
-                    self._append_trade(maybe, mode="live")
-
-                # 2) entry on new bar open
-                if not self.in_pos:
-                    sig = self.strat.generate_signal(df_slice)
-                    if sig["signal"] in ("LONG", "SHORT"):
-                        atr = float(sig.get("meta", {}).get("atr14", 0.0)) or float(df_slice["close"].iloc[-1] * 0.005)
-                        next_open = float(cur_row.open)  # open of the newest bar
-                        self._enter_next_open(next_open, atr, sig["signal"], cur_row.Index)
-
+                last_fed_ts = self._live_tick(df, last_fed_ts)
                 last_seen_ts = ts
-                # small heartbeat print (optional)
-                print(f"[{datetime.now(timezone.utc).isoformat()}] Live tick @ {ts} | equity={self.equity:.2f} | in_pos={self.in_pos}")
-
                 time.sleep(poll_seconds)
 
             except KeyboardInterrupt:
@@ -259,3 +278,22 @@ class PaperRunner:
             except Exception as e:
                 print("Error in live loop:", e)
                 time.sleep(3)
+
+    def _run_feed(self, feed: Feed):
+        closed = feed.history(_LIVE_BARS - 1)
+        last_fed_ts = None
+        feed.start()
+        try:
+            for ev in feed:
+                if not ev.confirmed:
+                    continue
+                try:
+                    closed = append_bar(closed, ev, _LIVE_BARS - 1)
+                    df = with_forming_bar(closed, self.cfg.interval)
+                    last_fed_ts = self._live_tick(df, last_fed_ts)
+                except Exception as e:
+                    print("Error in live loop:", e)
+        except KeyboardInterrupt:
+            print("Stopping live runner...")
+        finally:
+            feed.stop()
@@ -1,6 +1,6 @@
 # strategy/base.py
 from __future__ import annotations
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Optional, Tuple
 import pandas as pd
 
 Signal = Literal["LONG", "SHORT", "FLAT"]
@@ -13,6 +13,10 @@ class Strategy:
         """
         return 50
 
+    def params(self) -> Dict[str, Any]:
+        """Constructor parameters (public attributes) - identifies the strategy config in caches/reports."""
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
     def generate_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Given a DataFrame with at least warmup() rows, return:
@@ -23,3 +27,54 @@ class Strategy:
         }
         """
         raise NotImplementedError
+
+    def generate_signals(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Optional batch version of generate_signal() for backtests/replays.
+        Return a DataFrame aligned to df.index with columns:
+          "signal": "LONG" | "SHORT" | "FLAT"   (what generate_signal(df.iloc[:i+1]) would say)
+          "atr14":  float                        (same as meta["atr14"]; NaN if not available)
+        Return None if the strategy only supports the per-bar path.
+        """
+        return None
+
+    # ----- streaming interface (live/paper) -----
+    def reset(self) -> None:
+        """Clear any streaming state kept by on_bar()."""
+
+    def on_bar(self, bar) -> Optional[Dict[str, Any]]:
+        """
+        Optional streaming version of generate_signal(): feed ONE new closed bar
+        (anything with .open/.high/.low/.close, e.g. a df.itertuples() row) and get the
+        signal dict for the history seen so far, in O(1).
+        Return None if the strategy only supports generate_signal(df).
+        """
+        return None
+
+    def prime(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """One-time warmup: reset, then feed df bar by bar. Returns the last signal (None = no streaming)."""
+        self.reset()
+        sig = None
+        for bar in df.itertuples():
+            sig = self.on_bar(bar)
+            if sig is None:
+                return None
+        return sig
+
+    def catch_up(self, df: pd.DataFrame, last_ts=None) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """
+        Feed the bars of df (closed bars, oldest->newest) that are newer than last_ts.
+        Re-primes from df if there is no state yet or we fell behind the window.
+        Returns (signal or None, timestamp of the last bar fed).
+        """
+        if df.empty:
+            return None, last_ts
+        if last_ts is None or last_ts < df.index[0]:
+            return self.prime(df), df.index[-1]
+
+        sig = None
+        for bar in df[df.index > last_ts].itertuples():
+            sig = self.on_bar(bar)
+            if sig is None:
+                break
+        return sig, df.index[-1]
@@ -1,16 +1,20 @@
 # strategy/sma_cross.py
 from __future__ import annotations
 from typing import Dict, Any
+import math
+import numpy as np
 import pandas as pd
 
 from strategy.base import Strategy, Signal
-from data.market_data import add_sma, add_atr
+from data.indicator_cache import indicator
+from data.streaming import StreamSMA, StreamATR
 
 class SmaCross(Strategy):
     def __init__(self, fast: int = 20, slow: int = 50):
         assert fast < slow, "fast MA must be smaller than slow MA"
         self.fast = fast
         self.slow = slow
+        self.reset()
 
     def warmup(self) -> int:
         # need enough bars to compute slow SMA and ATR
@@ -20,56 +24,83 @@ class SmaCross(Strategy):
         if len(df) < self.warmup():
             return {"signal": "FLAT", "reason": "not_enough_data", "meta": {}}
 
-        work = df.copy()
-        work[f"sma{self.fast}"] = add_sma(work, self.fast)
-        work[f"sma{self.slow}"] = add_sma(work, self.slow)
-        work["atr14"] = add_atr(work, 14)
+        # shared cache: other strategies/the runner asking for the same series reuse it
+        fast = indicator(df, "sma", period=self.fast)
+        slow = indicator(df, "sma", period=self.slow)
+        atr = indicator(df, "atr", period=14)
 
-        last = work.iloc[-1]
-        prev = work.iloc[-2]
-
-        fast_now = last[f"sma{self.fast}"]
-        slow_now = last[f"sma{self.slow}"]
-        fast_prev = prev[f"sma{self.fast}"]
-        slow_prev = prev[f"sma{self.slow}"]
+        return self._decide(
+            fast_prev=fast.iloc[-2],
+            slow_prev=slow.iloc[-2],
+            fast_now=fast.iloc[-1],
+            slow_now=slow.iloc[-1],
+            price=df["close"].iloc[-1],
+            atr=atr.iloc[-1],
+        )
 
+    def _decide(self, fast_prev, slow_prev, fast_now, slow_now, price, atr) -> Dict[str, Any]:
         # Guard against NaNs during warmup
         if pd.isna(fast_now) or pd.isna(slow_now) or pd.isna(fast_prev) or pd.isna(slow_prev):
             return {"signal": "FLAT", "reason": "sma_warming_up", "meta": {}}
 
+        meta = {
+            "price": float(price),
+            "fast": float(fast_now),
+            "slow": float(slow_now),
+            "atr14": float(atr),
+        }
+
         # Cross up: yesterday fast <= slow, today fast > slow -> LONG
         if fast_prev <= slow_prev and fast_now > slow_now:
-            return {
-                "signal": "LONG",
-                "reason": "bull_cross",
-                "meta": {
-                    "price": float(last["close"]),
-                    "fast": float(fast_now),
-                    "slow": float(slow_now),
-                    "atr14": float(last["atr14"]),
-                },
-            }
+            return {"signal": "LONG", "reason": "bull_cross", "meta": meta}
 
         # Cross down: yesterday fast >= slow, today fast < slow -> SHORT
         if fast_prev >= slow_prev and fast_now < slow_now:
-            return {
-                "signal": "SHORT",
-                "reason": "bear_cross",
-                "meta": {
-                    "price": float(last["close"]),
-                    "fast": float(fast_now),
-                    "slow": float(slow_now),
-                    "atr14": float(last["atr14"]),
-                },
-            }
-
-        return {
-            "signal": "FLAT",
-            "reason": "no_cross",
-            "meta": {
-                "price": float(last["close"]),
-                "fast": float(fast_now),
-                "slow": float(slow_now),
-                "atr14": float(last["atr14"]),
-            },
-        }
+            return {"signal": "SHORT", "reason": "bear_cross", "meta": meta}
+
+        return {"signal": "FLAT", "reason": "no_cross", "meta": meta}
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized generate_signal() over every bar at once.
+        Row i matches generate_signal(df.iloc[: i + 1]) (SMA/ATR are causal, so the
+        full-history values at i are the same as the ones computed on the slice).
+        """
+        fast = indicator(df, "sma", period=self.fast)
+        slow = indicator(df, "sma", period=self.slow)
+        atr = indicator(df, "atr", period=14)
+        fast_prev = fast.shift(1)
+        slow_prev = slow.shift(1)
+
+        ready = (fast.notna() & slow.notna() & fast_prev.notna() & slow_prev.notna()).to_numpy()
+        ready = ready & (np.arange(1, len(df) + 1) >= self.warmup())
+
+        # same precedence as generate_signal: bull cross first, then bear cross
+        bull = ready & ((fast_prev <= slow_prev) & (fast > slow)).to_numpy()
+        bear = ready & ~bull & ((fast_prev >= slow_prev) & (fast < slow)).to_numpy()
+
+        signal = np.where(bull, "LONG", np.where(bear, "SHORT", "FLAT"))
+        return pd.DataFrame({"signal": signal, "atr14": atr.to_numpy()}, index=df.index)
+
+    # ----- streaming (O(1) per bar) -----
+    def reset(self) -> None:
+        self._fast_ma = StreamSMA(self.fast)
+        self._slow_ma = StreamSMA(self.slow)
+        self._atr = StreamATR(14)
+        self._prev_fast = math.nan
+        self._prev_slow = math.nan
+        self._bars = 0
+
+    def on_bar(self, bar) -> Dict[str, Any]:
+        close = float(bar.close)
+        fast_now = self._fast_ma.update(close)
+        slow_now = self._slow_ma.update(close)
+        atr = self._atr.update(float(bar.high), float(bar.low), close)
+
+        fast_prev, slow_prev = self._prev_fast, self._prev_slow
+        self._prev_fast, self._prev_slow = fast_now, slow_now
+        self._bars += 1
+
+        if self._bars < self.warmup():
+            return {"signal": "FLAT", "reason": "not_enough_data", "meta": {}}
+        return self._decide(fast_prev, slow_prev, fast_now, slow_now, close, atr)